@@ -1,262 +1,365 @@
-import matplotlib.pyplot as plt
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
+# matplotlib n'est importé qu'au premier dessin (plusieurs centaines de ms), et pyplot
+# seulement en mode interactif: importer ce module reste léger
+
+# Déplacement (colonne, ligne) associé à chaque action, pour les flèches de politique
+DIRECTIONS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+
 class Affichage:
-    def __init__(self, frozen_lake):
+    def __init__(self, frozen_lake, output_dir=None, image_format='png', label_limit=20, arrow_limit=100):
+        """
+        Args:
+            frozen_lake: L'environnement FrozenLake
+            output_dir: None pour un affichage interactif (plt.show). Sinon, mode sans
+                affichage: chaque méthode enregistre sa figure dans ce répertoire, sans
+                pyplot ni fenêtre, et retourne le chemin du fichier
+            image_format: Format des fichiers enregistrés ('png' ou 'svg')
+            label_limit: Taille de grille au-delà de laquelle les étiquettes texte par case
+                (valeurs, S/G/X) et le quadrillage ne sont pas dessinés
+            arrow_limit: Taille de grille au-delà de laquelle la politique est dessinée
+                comme une image colorée par action plutôt qu'avec des flèches
+        """
         self.frozen_lake = frozen_lake
-
-    def afficher(self):
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.label_limit = label_limit
+        self.arrow_limit = arrow_limit
+    
+    def _subplots(self, nrows=1, ncols=1, figsize=None):
+        """
+        Crée une figure: via pyplot en mode interactif, sinon une Figure autonome
+        rendue par le canevas Agg (aucun backend graphique n'est sollicité).
+        """
+        if self.output_dir is None:
+            import matplotlib.pyplot as plt
+            return plt.subplots(nrows, ncols, figsize=figsize)
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots(nrows, ncols)
+    
+    def _terminer(self, fig, nom_fichier):
+        """
+        Affiche la figure (mode interactif) ou l'enregistre dans output_dir.
+        
+        Returns:
+            path: Chemin du fichier enregistré (None en mode interactif)
+        """
+        fig.tight_layout()
+        if self.output_dir is None:
+            import matplotlib.pyplot as plt
+            plt.show()
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{nom_fichier}.{self.image_format}")
+        fig.savefig(path, format=self.image_format)
+        return path
+    
+    def _etiquettes(self):
+        """
+        Indique si la grille est assez petite pour dessiner du texte case par case.
+        """
+        return self.frozen_lake.grid_size <= self.label_limit
+    
+    def _marquer_cases(self, ax, colors=('green', 'black', 'black'), dy=0.0, start=True, **text_kw):
+        """
+        Écrit S, G et X sur le départ, les buts et les pièges (petites grilles seulement).
+        """
+        if not self._etiquettes():
+            return
+        start_color, goal_color, trap_color = colors
+        for (i, j) in self.frozen_lake.trap_set:
+            ax.text(j, i + dy, 'X', ha='center', va='center', color=trap_color, **text_kw)
+        for (i, j) in self.frozen_lake.goal_set:
+            ax.text(j, i + dy, 'G', ha='center', va='center', color=goal_color, **text_kw)
+        if start:
+            i, j = self.frozen_lake.start
+            ax.text(j, i + dy, 'S', ha='center', va='center', color=start_color, **text_kw)
+    
+    def _quadriller(self, ax):
+        """
+        Trace le contour des cases et masque les graduations.
+        """
+        if self._etiquettes():
+            ax.set_xticks(np.arange(-0.5, self.frozen_lake.grid_size, 1), minor=True)
+            ax.set_yticks(np.arange(-0.5, self.frozen_lake.grid_size, 1), minor=True)
+            ax.grid(which='minor', color='black', linestyle='-', linewidth=1)
+        ax.tick_params(which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
+    
+    def _carte(self):
+        """
+        Grille des types de case: 2 pour les buts, -1 pour les pièges, 0 sinon.
+        """
         grid = np.zeros((self.frozen_lake.grid_size, self.frozen_lake.grid_size))
-        grid[self.frozen_lake.goal] = 2  # Objectif
-        for trap in self.frozen_lake.traps:
-            grid[trap] = -1  # Pièges
-
-        fig, ax = plt.subplots()
-        ax.imshow(grid, cmap='coolwarm', origin='upper')
+        grid[self.frozen_lake.goal_mask] = 2  # Objectif
+        grid[self.frozen_lake.trap_mask] = -1  # Pièges
+        return grid
+    
+    def _grille_etats(self, V):
+        """
+        Convertit des valeurs d'état ({(i, j): valeur} ou tableau (S,)) en grille (n, n).
+        """
+        n = self.frozen_lake.grid_size
+        if isinstance(V, Mapping):
+            return np.array([[V[(i, j)] for j in range(n)] for i in range(n)], dtype=float)
+        return np.asarray(V, dtype=float).reshape(n, n)
+    
+    def _grille_q(self, Q):
+        """
+        Convertit une Q-table (QTable, tableau (S, A) ou {état: {action: valeur}}) en tableau (n, n, A).
+        """
+        n = self.frozen_lake.grid_size
+        values = getattr(Q, 'values', Q)
+        if isinstance(values, np.ndarray):
+            return values.reshape(n, n, -1)
+        return np.array([[[Q[(i, j)][action] for action in self.frozen_lake.actions]
+                          for j in range(n)] for i in range(n)], dtype=float)
+    
+    def _grille_politique(self, policy):
+        """
+        Convertit une politique en grille (n, n) d'indices d'actions (-1 si non définie).
+        Formats acceptés: {état: {action: probabilité}}, {état: action} ou tableau (S,).
+        """
+        n = self.frozen_lake.grid_size
+        if not isinstance(policy, Mapping):
+            return np.asarray(policy).reshape(n, n)
+        index = {action: a for a, action in enumerate(self.frozen_lake.actions)}
+        grid = np.full((n, n), -1)
+        for state, choice in policy.items():
+            if isinstance(choice, Mapping):
+                choice = max(choice, key=choice.get)
+            grid[state] = index[choice]
+        return grid
+    
+    def afficher(self, nom_fichier='lac'):
+        fig, ax = self._subplots()
+        ax.imshow(self._carte(), cmap='coolwarm', origin='upper')
         
-        # Affichage des cases
-        for i in range(self.frozen_lake.grid_size):
-            for j in range(self.frozen_lake.grid_size):
-                if (i, j) == self.frozen_lake.start:
-                    ax.text(j, i, 'S', ha='center', va='center', fontsize=12, color='green')
-                elif (i, j) == self.frozen_lake.goal:
-                    ax.text(j, i, 'G', ha='center', va='center', fontsize=12, color='black')
-                elif (i, j) in self.frozen_lake.traps:
-                    ax.text(j, i, 'X', ha='center', va='center', fontsize=12, color='black')
-                elif (i, j) == self.frozen_lake.state:
-                    ax.text(j, i, 'P', ha='center', va='center', fontsize=12, color='blue')
+        # Affichage des cases spéciales et de la position de l'agent
+        self._marquer_cases(ax, fontsize=12)
+        if self._etiquettes() and self.frozen_lake.state not in self.frozen_lake.terminal_set \
+                and self.frozen_lake.state != self.frozen_lake.start:
+            i, j = self.frozen_lake.state
+            ax.text(j, i, 'P', ha='center', va='center', fontsize=12, color='blue')
         
-        ax.set_xticks(np.arange(-0.5, self.frozen_lake.grid_size, 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, self.frozen_lake.grid_size, 1), minor=True)
-        ax.grid(which='minor', color='black', linestyle='-', linewidth=1)
-        ax.tick_params(which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
-        plt.show()
+        self._quadriller(ax)
+        return self._terminer(fig, nom_fichier)
     
-    def afficher_q_table(self, Q):
+    def afficher_q_table(self, Q, nom_fichier='q_table'):
         """
         Affiche la Q-table sous forme de tableau.
         """
-        fig, axes = plt.subplots(1, len(self.frozen_lake.actions), figsize=(20, 5))
+        q_values = self._grille_q(Q)
+        fig, axes = self._subplots(1, len(self.frozen_lake.actions), figsize=(20, 5))
         fig.suptitle('Q-Table par Action', fontsize=16)
         
         for idx, action in enumerate(self.frozen_lake.actions):
-            q_values = np.zeros((self.frozen_lake.grid_size, self.frozen_lake.grid_size))
-            
-            for i in range(self.frozen_lake.grid_size):
-                for j in range(self.frozen_lake.grid_size):
-                    q_values[i, j] = Q[(i, j)][action]
-            
-            im = axes[idx].imshow(q_values, cmap='coolwarm')
+            im = axes[idx].imshow(q_values[:, :, idx], cmap='coolwarm')
             axes[idx].set_title(f'Action: {action}')
             
-            # Ajouter des étiquettes pour les cases spéciales
-            for i in range(self.frozen_lake.grid_size):
-                for j in range(self.frozen_lake.grid_size):
-                    if (i, j) == self.frozen_lake.start:
-                        axes[idx].text(j, i, 'S', ha='center', va='center', color='green', fontsize=12)
-                    elif (i, j) == self.frozen_lake.goal:
-                        axes[idx].text(j, i, 'G', ha='center', va='center', color='black', fontsize=12)
-                    elif (i, j) in self.frozen_lake.traps:
-                        axes[idx].text(j, i, 'X', ha='center', va='center', color='black', fontsize=12)
-                    
-                    axes[idx].text(j, i, f'{q_values[i, j]:.2f}', ha='center', va='bottom', color='black', fontsize=8)
+            # Ajouter des étiquettes pour les cases spéciales et les valeurs
+            self._marquer_cases(axes[idx], fontsize=12)
+            if self._etiquettes():
+                for (i, j), value in np.ndenumerate(q_values[:, :, idx]):
+                    axes[idx].text(j, i, f'{value:.2f}', ha='center', va='bottom', color='black', fontsize=8)
             
-            plt.colorbar(im, ax=axes[idx])
+            fig.colorbar(im, ax=axes[idx])
         
-        plt.tight_layout()
-        plt.show()
+        return self._terminer(fig, nom_fichier)
     
-    def afficher_policy(self, policy):
+    def afficher_policy(self, policy, nom_fichier='politique'):
         """
-        Affiche la politique optimale sur la grille.
+        Affiche la politique optimale sur la grille: le fond est dessiné par un seul imshow
+        et les flèches par un seul appel à quiver (ou une image colorée par action sur les
+        grandes grilles).
+        
+        Args:
+            policy: {état: {action: probabilité}}, {état: action} ou tableau (S,) d'indices d'actions
         """
-        policy_grid = np.zeros((self.frozen_lake.grid_size, self.frozen_lake.grid_size), dtype=object)
-        arrows = {
-            'up': '↑',
-            'down': '↓',
-            'left': '←',
-            'right': '→'
-        }
+        from matplotlib.colors import ListedColormap
+        actions = self._grille_politique(policy)
         
-        for i in range(self.frozen_lake.grid_size):
-            for j in range(self.frozen_lake.grid_size):
-                state = (i, j)
-                if state == self.frozen_lake.goal:
-                    policy_grid[i, j] = 'G'
-                elif state in self.frozen_lake.traps:
-                    policy_grid[i, j] = 'X'
-                else:
-                    best_action = max(policy[state], key=policy[state].get)
-                    policy_grid[i, j] = arrows[best_action]
+        # Fond: 0 case gelée, 1 but, 2 piège, 3 départ
+        kinds = np.zeros(actions.shape, dtype=int)
+        kinds[self.frozen_lake.goal_mask] = 1
+        kinds[self.frozen_lake.trap_mask] = 2
+        kinds[self.frozen_lake.start] = 3
         
-        fig, ax = plt.subplots(figsize=(10, 10))
+        fig, ax = self._subplots(figsize=(10, 10))
         ax.set_title('Politique Optimale')
+        ax.imshow(kinds, cmap=ListedColormap(['white', 'green', 'red', 'blue']), vmin=0, vmax=3, alpha=0.3)
         
-        # Dessiner la grille
-        for i in range(self.frozen_lake.grid_size):
-            for j in range(self.frozen_lake.grid_size):
-                if (i, j) == self.frozen_lake.goal:
-                    color = 'green'
-                elif (i, j) in self.frozen_lake.traps:
-                    color = 'red'
-                elif (i, j) == self.frozen_lake.start:
-                    color = 'blue'
-                else:
-                    color = 'white'
-                
-                ax.add_patch(plt.Rectangle((j, i), 1, 1, fill=True, color=color, alpha=0.3))
-                ax.text(j + 0.5, i + 0.5, policy_grid[i, j], ha='center', va='center', fontsize=20)
+        # Une flèche par case non terminale; au-delà de arrow_limit, les flèches seraient
+        # illisibles: chaque case est colorée selon son action
+        active = (actions >= 0) & ~self.frozen_lake.terminal_mask
+        if self.frozen_lake.grid_size <= self.arrow_limit:
+            dx = np.array([DIRECTIONS[action][0] for action in self.frozen_lake.actions])
+            dy = np.array([DIRECTIONS[action][1] for action in self.frozen_lake.actions])
+            rows, cols = np.nonzero(active)
+            chosen = actions[rows, cols]
+            ax.quiver(cols, rows, dx[chosen], dy[chosen], pivot='middle',
+                      angles='xy', scale_units='xy', scale=1 / 0.6)
+        else:
+            n_actions = len(self.frozen_lake.actions)
+            im = ax.imshow(np.ma.masked_where(~active, actions), cmap=ListedColormap([f'C{a}' for a in range(n_actions)]),
+                           vmin=-0.5, vmax=n_actions - 0.5, interpolation='nearest')
+            colorbar = fig.colorbar(im, ax=ax, ticks=range(len(self.frozen_lake.actions)))
+            colorbar.ax.set_yticklabels(self.frozen_lake.actions)
         
-        ax.set_xlim(0, self.frozen_lake.grid_size)
-        ax.set_ylim(0, self.frozen_lake.grid_size)
-        ax.set_xticks(np.arange(0, self.frozen_lake.grid_size + 1, 1))
-        ax.set_yticks(np.arange(0, self.frozen_lake.grid_size + 1, 1))
-        ax.grid(True)
-        ax.set_aspect('equal')
-        
-        # Inverser l'axe y pour avoir (0,0) en haut à gauche
-        ax.invert_yaxis()
-        
-        plt.tight_layout()
-        plt.show()
-
-    def afficher_valeurs_etat(self, V):
+        self._marquer_cases(ax, fontsize=20, start=False)
+        self._quadriller(ax)
+        return self._terminer(fig, nom_fichier)
+    
+    def afficher_valeurs_etat(self, V, nom_fichier='valeurs_etat'):
         """
         Affiche les valeurs d'état sur la grille.
         
         Args:
-            V: Dictionnaire des valeurs d'état
+            V: Dictionnaire des valeurs d'état, ou tableau (S,)
         """
-    
+        
         # Créer une grille des valeurs d'état
-        values = np.zeros((self.frozen_lake.grid_size, self.frozen_lake.grid_size))
-        for i in range(self.frozen_lake.grid_size):
-            for j in range(self.frozen_lake.grid_size):
-                values[i, j] = V[(i, j)]
+        values = self._grille_etats(V)
         
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = self._subplots(figsize=(10, 8))
         im = ax.imshow(values, cmap='viridis')
         ax.set_title('Valeurs d\'État')
         
         # Ajouter les valeurs numériques et les indicateurs spéciaux (S, G, X)
-        for i in range(self.frozen_lake.grid_size):
-            for j in range(self.frozen_lake.grid_size):
-                text_color = 'white' if values[i, j] < 0 else 'black'
-                
-                # Afficher la valeur d'état
-                ax.text(j, i, f'{values[i, j]:.2f}', ha='center', va='center', 
+        if self._etiquettes():
+            for (i, j), value in np.ndenumerate(values):
+                text_color = 'white' if value < 0 else 'black'
+                ax.text(j, i, f'{value:.2f}', ha='center', va='center',
                         color=text_color, fontsize=9)
-                
-                # Ajouter des marqueurs pour les cases spéciales
-                if (i, j) == self.frozen_lake.start:
-                    ax.text(j, i-0.3, 'S', ha='center', va='center', 
-                            color='green', fontsize=12, weight='bold')
-                elif (i, j) == self.frozen_lake.goal:
-                    ax.text(j, i-0.3, 'G', ha='center', va='center', 
-                            color='gold', fontsize=12, weight='bold')
-                elif (i, j) in self.frozen_lake.traps:
-                    ax.text(j, i-0.3, 'X', ha='center', va='center', 
-                            color='red', fontsize=12, weight='bold')
+        self._marquer_cases(ax, colors=('green', 'gold', 'red'), dy=-0.3, fontsize=12, weight='bold')
         
         # Ajouter une barre de couleur
-        plt.colorbar(im, ax=ax)
+        fig.colorbar(im, ax=ax)
         
         # Configurer les axes
-        ax.set_xticks(np.arange(self.frozen_lake.grid_size))
-        ax.set_yticks(np.arange(self.frozen_lake.grid_size))
-        ax.set_xticklabels(range(self.frozen_lake.grid_size))
-        ax.set_yticklabels(range(self.frozen_lake.grid_size))
+        if self._etiquettes():
+            ax.set_xticks(np.arange(self.frozen_lake.grid_size))
+            ax.set_yticks(np.arange(self.frozen_lake.grid_size))
+            ax.set_xticklabels(range(self.frozen_lake.grid_size))
+            ax.set_yticklabels(range(self.frozen_lake.grid_size))
+            ax.grid(color='black', linestyle='-', linewidth=0.5, alpha=0.2)
         ax.set_xlabel('Colonne')
         ax.set_ylabel('Ligne')
-        ax.grid(color='black', linestyle='-', linewidth=0.5, alpha=0.2)
         
-        plt.tight_layout()
-        plt.show()
-        
-    def afficher_statistiques(self, rewards, steps):
+        return self._terminer(fig, nom_fichier)
+    
+    def afficher_statistiques(self, rewards, steps=None, nom_fichier='statistiques'):
         """
         Affiche les statistiques d'apprentissage: récompenses et nombre d'étapes par épisode.
         
         Args:
-            rewards: Liste des récompenses par épisode
-            steps: Liste du nombre d'étapes par épisode
+            rewards: Liste des récompenses par épisode, ou un TrainingStats
+                (son historique sous-échantillonné est alors affiché)
+            steps: Liste du nombre d'étapes par épisode (ignoré avec un TrainingStats)
         """
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if hasattr(rewards, 'history'):
+            episodes, rewards, steps = rewards.history()
+            unit = 'épisodes' if len(episodes) < 2 else f'blocs de {episodes[0]} épisodes'
+        else:
+            episodes = np.arange(1, len(rewards) + 1)
+            unit = 'épisodes'
+        
+        fig, axes = self._subplots(2, 2, figsize=(15, 10))
         fig.suptitle('Statistiques d\'apprentissage', fontsize=16)
         
         # Graphique des récompenses
-        axes[0, 0].plot(rewards)
+        axes[0, 0].plot(episodes, rewards)
         axes[0, 0].set_title('Récompenses par épisode')
         axes[0, 0].set_xlabel('Épisode')
         axes[0, 0].set_ylabel('Récompense')
         
         # Graphique des étapes
-        axes[0, 1].plot(steps)
+        axes[0, 1].plot(episodes, steps)
         axes[0, 1].set_title('Nombre d\'étapes par épisode')
         axes[0, 1].set_xlabel('Épisode')
         axes[0, 1].set_ylabel('Nombre d\'étapes')
         
-        # Moyenne mobile des récompenses (fenêtre de 100 épisodes)
+        # Moyennes mobiles (fenêtre de 100 points) par sommes cumulées, en O(n)
         window_size = min(100, len(rewards))
         if window_size > 0:
-            moving_avg_rewards = np.convolve(rewards, np.ones(window_size)/window_size, mode='valid')
-            axes[1, 0].plot(moving_avg_rewards)
-            axes[1, 0].set_title(f'Moyenne mobile des récompenses (fenêtre de {window_size} épisodes)')
+            axes[1, 0].plot(episodes[window_size - 1:], self._moyenne_mobile(rewards, window_size))
+            axes[1, 0].set_title(f'Moyenne mobile des récompenses (fenêtre de {window_size} {unit})')
             axes[1, 0].set_xlabel('Épisode')
             axes[1, 0].set_ylabel('Récompense moyenne')
-        
-        # Moyenne mobile des étapes (fenêtre de 100 épisodes)
-        if window_size > 0:
-            moving_avg_steps = np.convolve(steps, np.ones(window_size)/window_size, mode='valid')
-            axes[1, 1].plot(moving_avg_steps)
-            axes[1, 1].set_title(f'Moyenne mobile des étapes (fenêtre de {window_size} épisodes)')
+            
+            axes[1, 1].plot(episodes[window_size - 1:], self._moyenne_mobile(steps, window_size))
+            axes[1, 1].set_title(f'Moyenne mobile des étapes (fenêtre de {window_size} {unit})')
             axes[1, 1].set_xlabel('Épisode')
             axes[1, 1].set_ylabel('Nombre moyen d\'étapes')
         
-        plt.tight_layout()
-        plt.show()
-        
-    def afficher_trajectory(self, trajectory):
+        return self._terminer(fig, nom_fichier)
+    
+    @staticmethod
+    def _moyenne_mobile(values, window_size):
+        """
+        Moyenne mobile sur window_size valeurs consécutives (mode 'valid').
+        """
+        cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        return (cumsum[window_size:] - cumsum[:-window_size]) / window_size
+    
+    def afficher_trajectory(self, trajectory, nom_fichier='trajectoire'):
         """
         Affiche la trajectoire d'un agent dans l'environnement.
         
         Args:
             trajectory: Liste de tuples (état, action, récompense)
         """
-        # Créer une grille pour la trajectoire
-        grid = np.zeros((self.frozen_lake.grid_size, self.frozen_lake.grid_size))
-        grid[self.frozen_lake.goal] = 2  # Objectif
-        for trap in self.frozen_lake.traps:
-            grid[trap] = -1  # Pièges
-        
-        fig, ax = plt.subplots(figsize=(10, 10))
-        ax.imshow(grid, cmap='coolwarm', origin='upper')
+        fig, ax = self._subplots(figsize=(10, 10))
+        ax.imshow(self._carte(), cmap='coolwarm', origin='upper')
         
-        # Dessiner la trajectoire
-        prev_state = None
-        for state, action, reward in trajectory:
-            if prev_state is not None:
-                ax.arrow(prev_state[1], prev_state[0], 
-                        state[1] - prev_state[1], state[0] - prev_state[0],
-                        head_width=0.2, head_length=0.2, fc='black', ec='black')
-            prev_state = state
+        # Dessiner la trajectoire: une flèche par déplacement, en un seul appel à quiver
+        positions = np.array([state for state, action, reward in trajectory], dtype=float).reshape(-1, 2)
+        if len(positions) > 1:
+            moves = np.diff(positions, axis=0)
+            ax.quiver(positions[:-1, 1], positions[:-1, 0], moves[:, 1], moves[:, 0],
+                      angles='xy', scale_units='xy', scale=1, color='black', width=0.005)
         
         # Affichage des cases spéciales
-        for i in range(self.frozen_lake.grid_size):
-            for j in range(self.frozen_lake.grid_size):
-                if (i, j) == self.frozen_lake.start:
-                    ax.text(j, i, 'S', ha='center', va='center', fontsize=12, color='green')
-                elif (i, j) == self.frozen_lake.goal:
-                    ax.text(j, i, 'G', ha='center', va='center', fontsize=12, color='black')
-                elif (i, j) in self.frozen_lake.traps:
-                    ax.text(j, i, 'X', ha='center', va='center', fontsize=12, color='black')
+        self._marquer_cases(ax, fontsize=12)
         
         ax.set_title('Trajectoire de l\'agent')
-        ax.set_xticks(np.arange(-0.5, self.frozen_lake.grid_size, 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, self.frozen_lake.grid_size, 1), minor=True)
-        ax.grid(which='minor', color='black', linestyle='-', linewidth=1)
-        ax.tick_params(which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
-        
-        plt.tight_layout()
-        plt.show()
+        self._quadriller(ax)
+        return self._terminer(fig, nom_fichier)
+
+def render_batch(jobs, output_dir, image_format='png', max_workers=None, **options):
+    """
+    Rend un lot de figures sans affichage, réparties sur un ProcessPoolExecutor.
+
+    Args:
+        jobs: Liste de (frozen_lake, méthode, arguments, nom_fichier), par exemple
+            (lake, 'afficher_policy', (policy,), 'politique_0')
+        output_dir: Répertoire de sortie
+        image_format: Format des fichiers ('png' ou 'svg')
+        max_workers: Nombre de processus (par défaut: nombre de cœurs)
+        options: Options transmises à Affichage (label_limit, arrow_limit)
+
+    Returns:
+        paths: Chemins des fichiers enregistrés, dans l'ordre des jobs
+    """
+    tasks = []
+    for frozen_lake, method, args, nom_fichier in jobs:
+        if not method.startswith('afficher'):
+            raise ValueError(f"Méthode d'affichage inconnue: {method!r}")
+        tasks.append((frozen_lake, method, tuple(args), nom_fichier, output_dir, image_format, options))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_one, tasks))
 
+def _render_one(task):
+    """
+    Rend une figure dans un processus de travail.
+    """
+    frozen_lake, method, args, nom_fichier, output_dir, image_format, options = task
+    affichage = Affichage(frozen_lake, output_dir=output_dir, image_format=image_format, **options)
+    return getattr(affichage, method)(*args, nom_fichier=nom_fichier)
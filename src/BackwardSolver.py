@@ -0,0 +1,105 @@
+import numpy as np
+from src.ValueIteration import ValueIteration
+
+class BackwardSolver(ValueIteration):
+    """
+    Solveur exact pour FrozenLake déterministe, par parcours en largeur inverse depuis
+    les buts. Les cases gelées ne rapportant rien, la valeur optimale d'un état à d pas
+    du but le plus proche (sans traverser de piège) vaut goal * gamma^(d - 1).
+    Un état d'où aucun but n'est accessible vaut 0 s'il peut circuler entre cases
+    gelées, sinon la meilleure option entre tomber dans un piège et heurter un bord
+    indéfiniment (-10 / (1 - gamma)).
+
+    Le calcul coûte O(S * A), sans itération jusqu'à convergence: il sert de référence
+    rapide et d'oracle de correction pour les autres backends. Les résultats ont le même
+    format que ValueIteration.run.
+    """
+    def __init__(self, frozen_lake, gamma=0.9):
+        """
+        Args:
+            frozen_lake: L'environnement FrozenLake
+            gamma: Facteur de réduction pour les récompenses futures (0 <= gamma < 1)
+        """
+        super().__init__(frozen_lake, gamma=gamma, backend='numpy')
+
+    def run(self, seuil=None, max_iterations=None, as_dict=False):
+        """
+        Calcule exactement les valeurs d'état, les valeurs d'action et une politique optimale.
+        La signature est celle de ValueIteration.run, pour servir de remplaçant direct.
+
+        Args:
+            seuil: Ignoré (calcul exact, sans itération)
+            max_iterations: Ignoré
+            as_dict: Retourner des dictionnaires indexés par (i, j)
+
+        Returns:
+            V: Valeurs d'état optimales
+            policy: Politique optimale (première meilleure action en cas d'égalité)
+            Q: Valeurs d'action
+        """
+        self._check_rewards()
+        self.stats.reset()
+        next_state, reward, discount = self._compiled_backup()
+        terminal = self.frozen_lake.get_transition_model()[2]
+
+        with self.stats.phase('bfs'):
+            distance = self._goal_distances()
+        reachable = (distance > 0) & ~terminal
+
+        V = np.zeros(self.n_states)
+        V[reachable] = self.frozen_lake.rewards['goal'] * self.gamma ** (distance[reachable] - 1.0)
+
+        # États sans but accessible ni case gelée voisine: piège ou chocs répétés contre un bord
+        free = ~terminal[next_state] & (next_state != np.arange(self.n_states)[:, None])
+        stuck = ~reachable & ~terminal & ~free.any(axis=1)
+        if stuck.any():
+            bump = next_state[stuck] == np.flatnonzero(stuck)[:, None]
+            options = np.where(bump, self.frozen_lake.rewards['wall'] / (1 - self.gamma), reward[stuck])
+            V[stuck] = options.max(axis=1)
+
+        Q = reward + discount * V[next_state]
+        self.V_array = V
+        self.Q_array = Q
+        self.policy_array = Q.argmax(axis=1)
+        self.iterations = 0
+        self.backups = self.n_states
+        self.stats.count('backups', self.backups)
+
+        if as_dict:
+            return self.to_dict()
+        return self.V_array, self.policy_array, self.Q_array
+
+    def _check_rewards(self):
+        """
+        Vérifie que les récompenses correspondent aux hypothèses du solveur.
+        """
+        rewards = self.frozen_lake.rewards
+        if rewards['frozen'] != 0 or rewards['goal'] <= 0 or rewards['wall'] > 0:
+            raise ValueError("BackwardSolver suppose frozen == 0, goal > 0 et wall <= 0")
+        if self.frozen_lake.is_slippery:
+            raise ValueError("BackwardSolver suppose une dynamique déterministe (success_prob == 1)")
+        if not 0 <= self.gamma < 1:
+            raise ValueError(f"gamma doit être dans [0, 1): {self.gamma}")
+
+    def _goal_distances(self):
+        """
+        Parcours en largeur inverse, niveau par niveau, depuis tous les buts.
+
+        Returns:
+            distance: Tableau (S,) du nombre de pas vers le but le plus proche
+                (0 pour les buts, -1 si aucun but n'est accessible)
+        """
+        terminal = self.frozen_lake.get_transition_model()[2]
+        distance = np.full(self.n_states, -1, dtype=np.int64)
+        frontier = np.flatnonzero(self.frozen_lake.goal_mask.ravel())
+        distance[frontier] = 0
+
+        level = 0
+        while len(frontier):
+            level += 1
+            # Prédécesseurs non terminaux et non visités des états de la frontière
+            candidates = self.frozen_lake.predecessors_of(frontier)
+            frontier = np.unique(candidates[(distance[candidates] < 0) & ~terminal[candidates]])
+            distance[frontier] = level
+
+        return distance
@@ -0,0 +1,140 @@
+import numpy as np
+from src.Callbacks import hook, make_callback
+from src.FrozenLake import FrozenLake
+from src.Instrumentation import Instrumentation
+from src.ValueIteration import bellman_backup, compile_backup
+
+class BatchPlanner:
+    """
+    Value Iteration simultanée sur un lot de cartes de même taille (par exemple la sortie
+    de generate_layouts). Les cartes partagent la géométrie de la grille, donc le tableau
+    (S, A) des états suivants; seules les récompenses et les états terminaux diffèrent.
+    Chaque itération est un unique backup vectorisé sur le bloc (B, S, A) des cartes
+    non convergées: le coût par carte de l'interpréteur et des objets disparaît.
+
+    Chaque carte s'arrête dès que sa propre variation maximale passe sous le seuil: ses
+    résultats sont alors figés et elle est retirée du bloc actif. Les résultats sont
+    identiques à ceux de ValueIteration(backend='numpy') carte par carte.
+    """
+    def __init__(self, layouts, gamma=0.9, callback=None, instrument=False):
+        """
+        Args:
+            layouts: Tableau (B, grid_size, grid_size) de cartes codées (FROZEN, HOLE, GOAL, START)
+            gamma: Facteur de réduction pour les récompenses futures
+            callback: Callback notifié à chaque itération et à la convergence du lot
+                (None: ProgressLogger; Callback() pour n'afficher rien)
+            instrument: Chronométrer les phases de run dans self.stats
+                (model, sweeps, policy); les compteurs sont toujours renseignés
+        """
+        layouts = np.asarray(layouts)
+        if layouts.ndim != 3 or layouts.shape[1] != layouts.shape[2]:
+            raise ValueError(f"Cartes attendues de forme (B, n, n): {layouts.shape}")
+        self.layouts = layouts
+        self.gamma = gamma
+        self.callback = make_callback(callback)
+        self.n_maps = layouts.shape[0]
+        self.grid_size = layouts.shape[1]
+        self.n_states = self.grid_size ** 2
+
+        # Environnement modèle: géométrie, actions et récompenses communes au lot
+        self._template = FrozenLake(grid_size=self.grid_size, goals=[(0, 0)], traps=[], start=(0, 0))
+        self.actions = self._template.actions
+        self.n_actions = len(self.actions)
+
+        # Résultats du dernier appel à run
+        self.V = None  # (B, S)
+        self.Q = None  # (B, S, A)
+        self.policy = None  # (B, S) indices d'actions
+        self.iterations = None  # (B,) itérations effectuées par carte
+        self.backups = 0
+        self.stats = Instrumentation(enabled=instrument)
+
+    def _compiled_backup(self):
+        """
+        Prépare les tableaux du backup de Bellman de toutes les cartes (voir compile_backup),
+        à partir des récompenses de FrozenLake appliquées aux cartes codées.
+
+        Returns:
+            next_state: Tableau (S, A) des états suivants, commun aux cartes
+            reward: Tableau (B, S, A) des récompenses (nulles depuis un état terminal)
+            discount: Tableau (B, S, A) valant gamma pour les transitions vers un état
+                non terminal, 0 sinon
+        """
+        next_state = self._template.get_transition_model()[0]
+        cells = self.layouts.reshape(self.n_maps, self.n_states)
+        reward = self._template.transition_rewards(self._template.layout_rewards(cells), next_state)
+        terminal = (cells == FrozenLake.HOLE) | (cells == FrozenLake.GOAL)
+        reward, discount = compile_backup(next_state, reward, terminal, self.gamma)
+        return next_state, reward, discount
+
+    def run(self, seuil=0.001, max_iterations=1000):
+        """
+        Résout toutes les cartes du lot.
+
+        Args:
+            seuil: Seuil de convergence, appliqué carte par carte
+            max_iterations: Nombre maximum d'itérations
+
+        Returns:
+            V: Tableau (B, S) des valeurs d'état optimales
+            policy: Tableau (B, S) des politiques optimales (première meilleure action en cas d'égalité)
+            Q: Tableau (B, S, A) des valeurs d'action
+        """
+        self.stats.reset()
+        with self.stats.phase('model'):
+            next_state, reward, discount = self._compiled_backup()
+
+        V_out = np.zeros((self.n_maps, self.n_states))
+        Q_out = np.zeros((self.n_maps, self.n_states, self.n_actions))
+        iterations_out = np.zeros(self.n_maps, dtype=np.int64)
+
+        # Bloc actif: cartes non convergées, compacté à chaque convergence
+        maps = np.arange(self.n_maps)
+        V = np.zeros((self.n_maps, self.n_states))
+        V_new = np.empty_like(V)
+        Q = np.empty_like(reward)
+        iterations = 0
+        delta = 0.0
+        on_iteration = hook(self.callback, 'on_iteration')
+
+        with self.stats.phase('sweeps'):
+            while len(maps):
+                iterations += 1
+
+                bellman_backup(V, next_state, reward, discount, Q, V_new)
+
+                deltas = np.abs(V_new - V).max(axis=1)
+                delta = deltas.max()
+                V, V_new = V_new, V
+
+                if on_iteration is not None:
+                    on_iteration(self, iterations, delta)
+
+                done = deltas < seuil
+                if iterations >= max_iterations:
+                    done[:] = True
+                if done.any():
+                    finished = maps[done]
+                    V_out[finished] = V[done]
+                    Q_out[finished] = Q[done]
+                    iterations_out[finished] = iterations
+
+                    keep = ~done
+                    maps = maps[keep]
+                    V = V[keep]
+                    V_new = np.empty_like(V)
+                    Q = np.empty((len(maps), self.n_states, self.n_actions))
+                    reward = reward[keep]
+                    discount = discount[keep]
+
+        self.iterations = iterations_out
+        self.backups = int(iterations_out.sum()) * self.n_states
+        self.stats.count('sweeps', iterations)
+        self.stats.count('backups', self.backups)
+        self.callback.on_converged(self, iterations, delta)
+
+        self.V = V_out
+        self.Q = Q_out
+        with self.stats.phase('policy'):
+            self.policy = Q_out.argmax(axis=2)
+        return self.V, self.policy, self.Q
@@ -0,0 +1,187 @@
+"""
+Mesures de performance des planificateurs et des algorithmes d'apprentissage.
+
+Usage:
+    python -m src.Benchmark --sizes 7 50 200 1000 --output benchmark.json
+
+Ce module n'importe pas matplotlib: il peut tourner sur une machine sans affichage.
+"""
+import argparse
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+from src.Callbacks import Callback
+from src.MapGenerator import generate_lakes
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.ValueIteration import ValueIteration
+
+DEFAULT_SIZES = (7, 50, 200, 1000)
+
+DEFAULT_HOLE_DENSITY = 0.1
+
+# Taille de la carte de l'exécution de chauffe de chaque cas
+WARMUP_SIZE = 7
+
+def make_lake(grid_size, hole_density=DEFAULT_HOLE_DENSITY):
+    """
+    Construit le lac de taille donnée utilisé pour les mesures: une carte générée
+    (soluble, graine fixe), identique d'une exécution à l'autre.
+    """
+    return generate_lakes(1, grid_size, hole_density=hole_density, seed=0)[0]
+
+def _measure(case, grid_size, hole_density, measure_memory):
+    """
+    Exécute un cas (fonction env -> métriques) et mesure son temps et sa mémoire crête.
+    Une exécution de chauffe non mesurée, sur une petite carte, effectue au préalable les
+    imports à la demande (scipy) et les initialisations ponctuelles.
+    La mémoire est mesurée lors d'une seconde exécution, tracemalloc ralentissant le code Python.
+    """
+    case(make_lake(min(grid_size, WARMUP_SIZE), hole_density))
+    env = make_lake(grid_size, hole_density)
+    start = time.perf_counter()
+    metrics = case(env)
+    metrics['time'] = time.perf_counter() - start
+
+    metrics['peak_memory'] = None
+    if measure_memory:
+        env = make_lake(grid_size, hole_density)
+        tracemalloc.start()
+        try:
+            case(env)
+            metrics['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return metrics
+
+def _value_iteration(backend, seuil, max_iterations):
+    def case(env):
+        vi = ValueIteration(env, backend=backend, seed=0, callback=Callback())
+        vi.run(seuil=seuil, max_iterations=max_iterations)
+        # backups: mises à jour d'état (ValueIteration.backups), pas les évaluations d'actions
+        return {'sweeps': vi.iterations, 'backups': vi.backups,
+                'converged': vi.iterations < max_iterations}
+    return case
+
+def _policy_iteration(evaluation, max_iterations):
+    def case(env):
+        pi = PolicyIteration(env, evaluation=evaluation, seed=0, callback=Callback())
+        pi.run(max_iterations=max_iterations)
+        # Un balayage d'amélioration par itération, plus les balayages d'évaluation
+        return {'sweeps': pi.eval_sweeps + pi.iterations, 'iterations': pi.iterations,
+                'converged': pi.iterations < max_iterations}
+    return case
+
+def _q_learning(episodes):
+    def case(env):
+        agent = QLearning(env, alpha=0.1, gamma=0.99, epsilon=0.1, seed=0, callback=Callback())
+        rewards, steps = agent.train(episodes=episodes)
+        return {'episodes': episodes, 'env_steps': int(sum(steps))}
+    return case
+
+def _q_learning_batch(episodes, n_envs, max_steps):
+    def case(env):
+        agent = QLearning(env, alpha=0.1, gamma=0.99, epsilon=0.1, seed=0, callback=Callback())
+        rewards, steps = agent.train_batch(episodes=episodes, n_envs=n_envs, max_steps=max_steps)
+        return {'episodes': episodes, 'env_steps': int(sum(steps))}
+    return case
+
+def benchmark_cases(grid_size, python_limit=50, learner_limit=20, episodes=1000,
+                    seuil=0.001, max_iterations=1000):
+    """
+    Liste les cas mesurés pour une taille de grille. Les implémentations qui bouclent
+    en Python sur les états sont limitées aux grilles de taille <= python_limit, et
+    l'entraînement épisode par épisode aux grilles de taille <= learner_limit.
+
+    Returns:
+        cases: Liste de (algorithme, variante, fonction env -> métriques)
+    """
+    cases = [('ValueIteration', 'numpy', _value_iteration('numpy', seuil, max_iterations))]
+    if grid_size <= python_limit:
+        cases.append(('ValueIteration', 'python', _value_iteration('python', seuil, max_iterations)))
+        cases.append(('PolicyIteration', 'sweep', _policy_iteration('sweep', max_iterations)))
+        cases.append(('PolicyIteration', 'linear', _policy_iteration('linear', max_iterations)))
+    if grid_size <= learner_limit:
+        cases.append(('QLearning', 'train', _q_learning(episodes)))
+    # Les épisodes sont tronqués pour borner le temps d'une marche aléatoire sur les grandes grilles
+    cases.append(('QLearning', 'train_batch', _q_learning_batch(episodes, 256, 4 * grid_size)))
+    return cases
+
+def run_benchmarks(sizes=DEFAULT_SIZES, hole_density=DEFAULT_HOLE_DENSITY, measure_memory=True, **options):
+    """
+    Mesure tous les cas pour chaque taille de grille.
+
+    Args:
+        sizes: Tailles de grille à mesurer
+        hole_density: Densité de trous des cartes générées
+        measure_memory: Mesurer la mémoire crête (double le temps d'exécution)
+        options: Options transmises à benchmark_cases
+
+    Returns:
+        report: Dictionnaire sérialisable en JSON ('meta' et 'results')
+    """
+    results = []
+    for grid_size in sizes:
+        for algorithm, variant, case in benchmark_cases(grid_size, **options):
+            metrics = _measure(case, grid_size, hole_density, measure_memory)
+            if 'sweeps' in metrics:
+                metrics['sweeps_per_second'] = metrics['sweeps'] / metrics['time']
+            if 'env_steps' in metrics:
+                metrics['env_steps_per_second'] = metrics['env_steps'] / metrics['time']
+            result = {'algorithm': algorithm, 'variant': variant, 'grid_size': grid_size,
+                      'n_states': grid_size ** 2, 'hole_density': hole_density}
+            result.update(metrics)
+            results.append(result)
+            print(_format(result))
+
+    return {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+def _format(result):
+    """
+    Ligne de résumé lisible d'un résultat.
+    """
+    line = f"{result['algorithm']:>15} {result['variant']:>11} {result['grid_size']:>5}x{result['grid_size']:<5} {result['time']:>9.3f} s"
+    if 'sweeps_per_second' in result:
+        line += f"  {result['sweeps_per_second']:>12,.1f} balayages/s"
+    if 'env_steps_per_second' in result:
+        line += f"  {result['env_steps_per_second']:>12,.0f} pas/s"
+    if result['peak_memory'] is not None:
+        line += f"  {result['peak_memory'] / 2 ** 20:>9.1f} Mo"
+    return line
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance FrozenLake")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--python-limit', type=int, default=50,
+                        help="taille maximale pour les implémentations Python état par état")
+    parser.add_argument('--learner-limit', type=int, default=20,
+                        help="taille maximale pour l'entraînement épisode par épisode")
+    parser.add_argument('--episodes', type=int, default=1000)
+    parser.add_argument('--hole-density', type=float, default=DEFAULT_HOLE_DENSITY)
+    parser.add_argument('--no-memory', action='store_true', help="ne pas mesurer la mémoire crête")
+    parser.add_argument('--output', default=None, help="fichier JSON de sortie")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, hole_density=args.hole_density, measure_memory=not args.no_memory,
+                            python_limit=args.python_limit, learner_limit=args.learner_limit,
+                            episodes=args.episodes)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import time
+
+class Callback:
+    """
+    Interface d'observation des algorithmes (ValueIteration, PolicyIteration, QLearning).
+    Toutes les méthodes sont sans effet: une sous-classe ne redéfinit que celles qui
+    l'intéressent. Les boucles n'appellent que les méthodes redéfinies (voir hook):
+    passer Callback() désactive tout affichage sans coût dans les boucles.
+    """
+    def on_iteration(self, algorithm, iteration, delta):
+        """
+        Fin d'un balayage (Value Iteration) ou d'une étape d'amélioration (Policy Iteration).
+
+        Args:
+            algorithm: L'algorithme observé
+            iteration: Numéro de l'itération (à partir de 1)
+            delta: Variation maximale des valeurs d'état au cours de l'itération
+        """
+
+    def on_episode_end(self, algorithm, episode, reward, steps):
+        """
+        Fin d'un épisode d'apprentissage.
+
+        Args:
+            algorithm: L'agent observé
+            episode: Numéro absolu de l'épisode (à partir de 1), en comptant les épisodes
+                restaurés depuis un point de reprise (voir QLearning.train)
+            reward: Récompense cumulée de l'épisode
+            steps: Nombre d'étapes de l'épisode
+        """
+
+    def on_converged(self, algorithm, iterations, delta):
+        """
+        Fin de la résolution.
+
+        Args:
+            algorithm: L'algorithme observé
+            iterations: Nombre d'itérations effectuées
+            delta: Dernière variation maximale (None pour les mises à jour asynchrones,
+                voir algorithm.backups)
+        """
+
+class ProgressLogger(Callback):
+    """
+    Affichage de la progression limité à un message toutes les `interval` secondes
+    (le premier et le message de convergence sont toujours affichés).
+    """
+    def __init__(self, interval=1.0, file=None):
+        """
+        Args:
+            interval: Délai minimal en secondes entre deux messages de progression
+            file: Flux de sortie (None pour sys.stdout)
+        """
+        self.interval = interval
+        self.file = file
+        self._last = None
+
+    def _due(self):
+        now = time.monotonic()
+        if self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+    def on_iteration(self, algorithm, iteration, delta):
+        if self._due():
+            print(f"Itération {iteration}, Delta = {delta:.6f}", file=self.file)
+
+    def on_episode_end(self, algorithm, episode, reward, steps):
+        if self._due():
+            stats = getattr(algorithm, 'training_stats', None)
+            mean = stats.moving_reward if stats is not None else reward
+            print(f"Épisode {episode}, Récompense Moyenne: {mean:.2f}", file=self.file)
+
+    def on_converged(self, algorithm, iterations, delta):
+        self._last = None
+        if delta is None:
+            print(f"Algorithme convergé après {algorithm.backups} mises à jour d'état", file=self.file)
+        else:
+            print(f"Algorithme convergé après {iterations} itérations avec delta = {delta:.6f}", file=self.file)
+
+def make_callback(callback):
+    """
+    Callback par défaut: None donne un ProgressLogger.
+    """
+    return ProgressLogger() if callback is None else callback
+
+def hook(callback, name):
+    """
+    Retourne la méthode `name` du callback, ou None si elle n'est pas redéfinie:
+    les boucles testent alors simplement `if hook is not None` sans appel de fonction.
+    """
+    if getattr(type(callback), name) is getattr(Callback, name):
+        return None
+    return getattr(callback, name)
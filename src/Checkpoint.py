@@ -0,0 +1,150 @@
+import glob
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+
+def save_checkpoint(path, arrays, separate=()):
+    """
+    Écrit un point de reprise de façon atomique: chaque fichier est écrit à côté de sa
+    destination puis renommé, si bien qu'un arrêt brutal pendant l'écriture laisse
+    intact le point de reprise précédent.
+
+    Les tableaux nommés dans separate (par exemple la Q-table) sont écrits dans des
+    fichiers .npy distincts, projetables en mémoire (voir load_checkpoint); le fichier
+    .npz principal, écrit en dernier, référence leur nom. Son renommage valide le point
+    de reprise, puis les fichiers .npy du point de reprise précédent sont supprimés.
+
+    Args:
+        path: Fichier .npz de destination
+        arrays: Dictionnaire {nom: tableau}
+        separate: Noms des tableaux à écrire dans des fichiers .npy distincts
+    """
+    stem = os.path.splitext(path)[0]
+    token = uuid.uuid4().hex[:8]
+    main = {name: array for name, array in arrays.items() if name not in separate}
+    written = set()
+    for name in separate:
+        file = f"{stem}.{name}.{token}.npy"
+        _write_atomic(file, lambda f, array=arrays[name]: np.save(f, array))
+        main[f'file_{name}'] = np.array(os.path.basename(file))
+        written.add(file)
+    _write_atomic(path, lambda f: np.savez(f, **main))
+
+    # Fichiers des points de reprise précédents, désormais inutiles
+    for name in separate:
+        for file in glob.glob(f"{glob.escape(stem)}.{name}.*.npy"):
+            if file not in written:
+                os.remove(file)
+
+def load_checkpoint(path, mmap_mode=None):
+    """
+    Lit un point de reprise écrit par save_checkpoint.
+
+    Args:
+        path: Fichier .npz du point de reprise
+        mmap_mode: Mode de projection en mémoire des tableaux écrits à part
+            (None pour les lire, 'r' pour les projeter en lecture seule)
+
+    Returns:
+        arrays: Dictionnaire {nom: tableau}
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    directory = os.path.dirname(path)
+    for key in [key for key in arrays if key.startswith('file_')]:
+        file = os.path.join(directory, str(arrays.pop(key)))
+        arrays[key[len('file_'):]] = np.load(file, mmap_mode=mmap_mode, allow_pickle=False)
+    return arrays
+
+def _write_atomic(path, write):
+    """
+    Écrit un fichier via write(f) dans un fichier temporaire, puis le renomme.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def encode_state(state):
+    """
+    Encode un état sérialisable en JSON (par exemple rng.bit_generator.state, dont les
+    entiers dépassent 64 bits) dans un tableau de texte stockable dans un .npz.
+    """
+    return np.array(json.dumps(state))
+
+def decode_state(array):
+    """
+    Décode un état encodé par encode_state.
+    """
+    return json.loads(str(array))
+
+class CheckpointWriter:
+    """
+    Écriture des points de reprise dans un fil d'exécution dédié: la boucle
+    d'entraînement ne fait que déposer une copie de son état (submit) et continue.
+    Si une écriture est encore en cours, seul le dernier état déposé est conservé:
+    l'entraînement n'attend jamais le disque.
+    """
+    def __init__(self, path, separate=()):
+        """
+        Args:
+            path: Fichier .npz de destination, remplacé à chaque écriture
+            separate: Tableaux écrits dans des fichiers .npy distincts (voir save_checkpoint)
+        """
+        self.path = path
+        self.separate = tuple(separate)
+        self.written = 0
+        self._pending = None
+        self._closed = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='CheckpointWriter', daemon=True)
+        self._thread.start()
+
+    def submit(self, arrays):
+        """
+        Dépose un état à écrire; les tableaux ne doivent plus être modifiés par l'appelant.
+        """
+        with self._condition:
+            if self._error is not None:
+                raise self._error
+            self._pending = arrays
+            self._condition.notify()
+
+    def close(self):
+        """
+        Écrit le dernier état déposé puis arrête le fil d'écriture.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                arrays, self._pending = self._pending, None
+            try:
+                save_checkpoint(self.path, arrays, self.separate)
+                self.written += 1
+            except Exception as error:  # transmise à l'appelant au prochain submit ou close
+                self._error = error
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -1,30 +1,291 @@
+import hashlib
+import json
+
 import numpy as np
 
 class FrozenLake:
-    def __init__(self, grid_size=7):
+    # Codes des cases d'une carte (voir get_layout / from_layout)
+    FROZEN, HOLE, GOAL, START = 0, 1, 2, 3
+    
+    def __init__(self, grid_size=7, goals=None, traps=None, start=None, success_prob=1.0, seed=None):
+        """
+        Args:
+            grid_size: Taille de la grille
+            goals: Cases but (par défaut: (0, 0))
+            traps: Cases piège (par défaut: la carte 7x7 du sujet)
+            start: Case de départ (par défaut: (6, 6))
+            success_prob: Probabilité que le mouvement voulu soit effectué (glissement):
+                sinon l'agent glisse vers l'une des deux directions perpendiculaires,
+                avec probabilité (1 - success_prob) / 2 chacune. 1.0: dynamique déterministe
+            seed: Graine ou np.random.Generator utilisé pour les glissements
+        """
+        if not 0 < success_prob <= 1:
+            raise ValueError(f"success_prob doit être dans ]0, 1]: {success_prob}")
         self.grid_size = grid_size
-        self.goal = (0, 0)
-        self.traps = [(2, 2), (0, 6), (4, 0), (4, 2), (6, 3), (5, 5), (4, 5)]  
-        self.start = (6, 6)  # état initial
+        if goals is None:
+            goals = [(0, 0)]
+        if traps is None:
+            traps = [(2, 2), (0, 6), (4, 0), (4, 2), (6, 3), (5, 5), (4, 5)]
+        self.goals = tuple((int(i), int(j)) for i, j in goals)
+        self.goal = self.goals[0]  # premier but (carte à but unique)
+        self._traps = dict.fromkeys((int(i), int(j)) for i, j in traps)  # ensemble ordonné
+        self.start = (6, 6) if start is None else (int(start[0]), int(start[1]))  # état initial
         self.state = self.start  # état courant
         self.actions = ['up', 'down', 'left', 'right']
+        self.success_prob = float(success_prob)
+        self.rng = np.random.default_rng(seed)
+        # Directions perpendiculaires vers lesquelles chaque action peut glisser
+        self.perpendicular = {
+            'up': ('left', 'right'),
+            'down': ('left', 'right'),
+            'left': ('up', 'down'),
+            'right': ('up', 'down')
+        }
         self.rewards = {
             'frozen': 0,
             'hole': -10,
-            'goal': 10
+            'goal': 10,
+            'wall': -10
         }
+        self._index_terminals()
         self.grid = self._create_grid()
+        self._model = None  # modèle de transition compilé (voir get_transition_model)
+        self._predecessors = None  # index inverse des transitions (voir get_predecessors)
+        self._sparse_model = None  # modèle stochastique compilé (voir get_sparse_model)
+   
+    @classmethod
+    def from_layout(cls, layout, **options):
+        """
+        Construit un environnement à partir d'une carte codée (FROZEN, HOLE, GOAL, START).
+        
+        Args:
+            layout: Tableau (grid_size, grid_size) de codes de cases
+            options: Options du constructeur (success_prob, seed)
+
+        Returns:
+            FrozenLake: L'environnement correspondant
+        """
+        layout = np.asarray(layout)
+        return cls(
+            grid_size=layout.shape[0],
+            goals=np.argwhere(layout == cls.GOAL).tolist(),
+            traps=np.argwhere(layout == cls.HOLE).tolist(),
+            start=np.argwhere(layout == cls.START)[0],
+            **options
+        )
+   
+    def get_layout(self):
+        """
+        Retourne la carte codée de l'environnement (FROZEN, HOLE, GOAL, START).
+        """
+        layout = np.full((self.grid_size, self.grid_size), self.FROZEN, dtype=np.int8)
+        layout[self.trap_mask] = self.HOLE
+        layout[self.goal_mask] = self.GOAL
+        layout[self.start] = self.START
+        return layout
+   
+    def map_hash(self):
+        """
+        Empreinte de la carte et de sa dynamique (carte codée, success_prob, récompenses):
+        deux environnements de même empreinte ont les mêmes tables V, Q et politique.
+        Sert à vérifier qu'une table enregistrée correspond à l'environnement (voir Storage).
+        
+        Returns:
+            digest: Empreinte SHA-1 hexadécimale
+        """
+        digest = hashlib.sha1(self.get_layout().tobytes())
+        digest.update(json.dumps([self.grid_size, self.success_prob, self.rewards], sort_keys=True).encode())
+        return digest.hexdigest()
+   
+    @property
+    def traps(self):
+        """
+        Pièges de la grille (vue en lecture seule, dérivée de la carte).
+        """
+        return tuple(self._traps)
+   
+    @property
+    def is_slippery(self):
+        """
+        Indique si la dynamique est stochastique (success_prob < 1).
+        """
+        return self.success_prob < 1.0
+   
+    def _index_terminals(self):
+        """
+        Construit les structures de recherche en O(1) des pièges, buts et états terminaux:
+        des ensembles (trap_set, goal_set, terminal_set) et des masques booléens
+        (trap_mask, goal_mask, terminal_mask).
+        """
+        self.trap_set = set(self._traps)
+        self.goal_set = set(self.goals)
+        self.terminal_set = self.trap_set | self.goal_set
+        self.trap_mask = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+        self.goal_mask = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+        if self._traps:
+            self.trap_mask[tuple(np.array(list(self._traps)).T)] = True
+        self.goal_mask[tuple(np.array(self.goals).T)] = True
+        self.terminal_mask = self.trap_mask | self.goal_mask
+   
+    def update_map(self, add_traps=(), remove_traps=(), goals=None):
+        """
+        Modifie la carte (ajout ou retrait de pièges, déplacement des buts) en ne mettant
+        à jour que les cases concernées, y compris les lignes du modèle de transition
+        s'il est déjà compilé.
+        
+        Args:
+            add_traps: Cases à transformer en pièges
+            remove_traps: Pièges à transformer en cases gelées
+            goals: Nouvelle liste de buts (None pour les conserver)
+        
+        Returns:
+            changed: Tableau trié des indices des cases dont le type a changé
+        """
+        # Validation complète avant toute modification: une erreur laisse la carte intacte
+        remove_traps = [self._cell(cell) for cell in remove_traps]
+        add_traps = [self._cell(cell) for cell in add_traps]
+        new_goals = self.goals
+        if goals is not None:
+            new_goals = tuple(self._cell(cell) for cell in goals)
+            if not new_goals:
+                raise ValueError("La carte doit conserver au moins un but")
+            if self.start in new_goals:
+                raise ValueError(f"Impossible de placer un but sur le départ: {self.start}")
+        for cell in add_traps:
+            if cell in new_goals or cell == self.start:
+                raise ValueError(f"Impossible de placer un piège sur le départ ou un but: {cell}")
+        
+        updates = {}
+        for cell in remove_traps:
+            if cell in self.trap_set:
+                updates[cell] = self.FROZEN
+        
+        if goals is not None:
+            for cell in self.goals:
+                updates[cell] = self.FROZEN
+            for cell in new_goals:
+                updates[cell] = self.GOAL
+        
+        for cell in add_traps:
+            updates[cell] = self.HOLE
+        
+        changed = []
+        for cell, kind in updates.items():
+            old = self.HOLE if cell in self.trap_set else self.GOAL if cell in self.goal_set else self.FROZEN
+            if kind == old:
+                continue
+            
+            # Retirer l'ancien type de case
+            if old == self.HOLE:
+                del self._traps[cell]
+                self.trap_set.discard(cell)
+                self.trap_mask[cell] = False
+            elif old == self.GOAL:
+                self.goal_set.discard(cell)
+                self.goal_mask[cell] = False
+            
+            # Ajouter le nouveau
+            if kind == self.HOLE:
+                self._traps[cell] = None
+                self.trap_set.add(cell)
+                self.trap_mask[cell] = True
+                self.grid[cell] = self.rewards['hole']
+            elif kind == self.GOAL:
+                self.goal_set.add(cell)
+                self.goal_mask[cell] = True
+                self.grid[cell] = self.rewards['goal']
+            else:
+                self.grid[cell] = self.rewards['frozen']
+            
+            if kind == self.FROZEN:
+                self.terminal_set.discard(cell)
+            else:
+                self.terminal_set.add(cell)
+            self.terminal_mask[cell] = kind != self.FROZEN
+            changed.append(self.state_to_index(cell))
+        
+        self.goals = new_goals
+        self.goal = self.goals[0]
+        
+        changed = np.array(sorted(changed), dtype=np.int64)
+        if self._model is not None and len(changed):
+            self._patch_transition_model(changed)
+        if len(changed):
+            self._sparse_model = None
+        return changed
+   
+    def _cell(self, cell):
+        """
+        Convertit une case en tuple (i, j) d'entiers, en vérifiant qu'elle est dans la grille.
+        """
+        i, j = int(cell[0]), int(cell[1])
+        if not (0 <= i < self.grid_size and 0 <= j < self.grid_size):
+            raise ValueError(f"Case hors de la grille {self.grid_size}x{self.grid_size}: {(i, j)}")
+        return i, j
+   
+    def _patch_transition_model(self, changed):
+        """
+        Met à jour les lignes du modèle de transition touchées par la modification des
+        cases changed: leur statut terminal et la récompense des transitions qui y mènent.
+        """
+        next_state, reward, terminal = self._model
+        terminal[changed] = self.terminal_mask.ravel()[changed]
+        
+        rows = np.unique(self.predecessors_of(changed))
+        targets = next_state[rows]
+        hit = np.isin(targets, changed) & (targets != rows[:, None])
+        reward[rows] = np.where(hit, self.grid.ravel()[targets], reward[rows])
+   
+    def is_trap(self, state):
+        """
+        Indique si l'état est un piège.
+        """
+        return state in self.trap_set
+   
+    def is_terminal(self, state):
+        """
+        Indique si l'état est terminal (but ou piège).
+        """
+        return state in self.terminal_set
    
     def _create_grid(self):
         """
         Crée la grille de l'environnement.
         """
-        grid = np.zeros((self.grid_size, self.grid_size))
-        grid[self.goal] = self.rewards['goal']
-        for trap in self.traps:
-            grid[trap] = self.rewards['hole']
+        return self.layout_rewards(self.get_layout())
+   
+    def layout_rewards(self, layout):
+        """
+        Récompense d'arrivée sur chaque case d'une ou plusieurs cartes codées
+        (FROZEN, HOLE, GOAL, START), selon self.rewards.
+        
+        Args:
+            layout: Tableau de codes de cases, de forme quelconque (par exemple (B, S))
+        
+        Returns:
+            grid: Tableau de même forme des récompenses d'arrivée
+        """
+        layout = np.asarray(layout)
+        grid = np.full(layout.shape, float(self.rewards['frozen']))
+        grid[layout == self.GOAL] = self.rewards['goal']
+        grid[layout == self.HOLE] = self.rewards['hole']
         return grid
    
+    def transition_rewards(self, grid, next_state):
+        """
+        Récompenses des transitions: celle de la case d'arrivée, ou la pénalité de bord
+        quand le mouvement laisse l'agent sur place.
+        
+        Args:
+            grid: Récompenses d'arrivée (..., S) (voir layout_rewards)
+            next_state: Tableau (S, A) des états suivants
+        
+        Returns:
+            reward: Tableau (..., S, A) des récompenses
+        """
+        bump = next_state == np.arange(len(next_state))[:, None]
+        return np.where(bump, float(self.rewards['wall']), np.asarray(grid, dtype=np.float64)[..., next_state])
+   
     def reset(self):
         """
         Réinitialise l'environnement à son état initial.
@@ -35,7 +296,159 @@ class FrozenLake:
         self.state = self.start
         return self.state
    
+    def state_to_index(self, state):
+        """
+        Convertit un état (i, j) en indice entier s = i * grid_size + j.
+        """
+        return state[0] * self.grid_size + state[1]
+   
+    def index_to_state(self, index):
+        """
+        Convertit un indice entier en état (i, j).
+        """
+        return divmod(int(index), self.grid_size)
+   
+    def get_transition_model(self):
+        """
+        Retourne le modèle de transition tabulaire de l'environnement.
+        Le modèle est compilé une seule fois puis mis en cache sur l'instance.
+        Les états sont indexés par s = i * grid_size + j et les actions par
+        leur position dans self.actions.
+        
+        Returns:
+            next_state: Tableau (S, A) des états suivants
+            reward: Tableau (S, A) des récompenses
+            terminal: Tableau (S,) des états terminaux (but ou pièges)
+        """
+        if self._model is None:
+            self._model = self._build_transition_model()
+        return self._model
+   
+    def get_sparse_model(self):
+        """
+        Retourne le modèle de transition stochastique (glissements compris), compilé une
+        seule fois puis mis en cache. La ligne s * A + a de P contient la distribution des
+        états suivants pour l'action a depuis s; les lignes des états terminaux sont vides.
+        Avec success_prob == 1, P contient un seul 1 par ligne (modèle déterministe).
+        
+        Returns:
+            P: Matrice creuse CSR (S * A, S) des probabilités de transition
+            reward: Tableau (S, A) des récompenses espérées (nulles depuis un état terminal)
+            terminal: Tableau (S,) des états terminaux
+        """
+        if self._sparse_model is None:
+            self._sparse_model = self._build_sparse_model()
+        return self._sparse_model
+   
+    def _build_sparse_model(self):
+        """
+        Compile la dynamique avec glissements en matrice creuse, à partir du modèle
+        déterministe: chaque action a trois issues (voulue et perpendiculaires).
+        """
+        import scipy.sparse as sp  # import à la demande: scipy n'est utile qu'ici
+        
+        next_state, reward, terminal = self.get_transition_model()
+        n_states, n_actions = next_state.shape
+        index = {action: a for a, action in enumerate(self.actions)}
+        slip = (1.0 - self.success_prob) / 2
+        
+        # Issues de chaque action: (actions effectives (A, 3), probabilités (3,))
+        outcomes = np.array([[a] + [index[side] for side in self.perpendicular[action]]
+                             for a, action in enumerate(self.actions)])
+        probs = np.array([self.success_prob, slip, slip])
+        if slip == 0:
+            outcomes, probs = outcomes[:, :1], probs[:1]
+        
+        active = ~terminal
+        rows = (np.arange(n_states)[:, None] * n_actions + np.arange(n_actions))[active]  # (S', A)
+        targets = next_state[active][:, outcomes]  # (S', A, K)
+        expected = np.zeros((n_states, n_actions))
+        expected[active] = (reward[active][:, outcomes] * probs).sum(axis=2)
+        
+        # Les issues identiques (chocs contre un même bord) sont sommées par la conversion en CSR
+        P = sp.coo_matrix(
+            (np.broadcast_to(probs, targets.shape).ravel(),
+             (np.repeat(rows.ravel(), len(probs)), targets.ravel())),
+            shape=(n_states * n_actions, n_states)
+        ).tocsr()
+        return P, expected, terminal.copy()
+   
+    def get_predecessors(self):
+        """
+        Retourne l'index inverse du modèle de transition (format CSR): les états depuis
+        lesquels une action mène à s sont predecessors[indptr[s]:indptr[s + 1]].
+        L'index ne dépend que de la géométrie de la grille (pas des pièges ni des buts):
+        il est construit une seule fois puis mis en cache sur l'instance.
+        
+        Returns:
+            indptr: Tableau (S + 1,) des bornes de chaque état
+            predecessors: Tableau des états sources, groupés par état d'arrivée
+        """
+        if self._predecessors is None:
+            next_state = self.get_transition_model()[0]
+            n_states, n_actions = next_state.shape
+            sources = np.repeat(np.arange(n_states), n_actions)
+            targets = next_state.ravel()
+            
+            # Transitions triées par état d'arrivée
+            # (tri stable: les doublons, dus aux chocs contre un bord, sont adjacents)
+            order = np.argsort(targets, kind='stable')
+            sources, targets = sources[order], targets[order]
+            unique = np.ones(len(sources), dtype=bool)
+            unique[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+            sources, targets = sources[unique], targets[unique]
+            indptr = np.zeros(n_states + 1, dtype=np.int64)
+            np.cumsum(np.bincount(targets, minlength=n_states), out=indptr[1:])
+            self._predecessors = (indptr, sources)
+        return self._predecessors
+   
+    def predecessors_of(self, states):
+        """
+        Retourne les prédécesseurs d'un ensemble d'états (avec répétitions possibles).
+        
+        Args:
+            states: Tableau d'indices d'états
+        """
+        indptr, predecessors = self.get_predecessors()
+        starts = indptr[states]
+        counts = indptr[states + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return predecessors[offsets]
+   
+    def _build_transition_model(self):
+        """
+        Compile la dynamique de step sous forme de tableaux NumPy.
+        """
+        n = self.grid_size
+        rows, cols = np.divmod(np.arange(n * n), n)
+        moves = {
+            'up': (-1, 0),
+            'down': (1, 0),
+            'left': (0, -1),
+            'right': (0, 1)
+        }
+        
+        next_state = np.empty((n * n, len(self.actions)), dtype=np.int64)
+        for a, action in enumerate(self.actions):
+            dx, dy = moves[action]
+            new_rows = np.clip(rows + dx, 0, n - 1)
+            new_cols = np.clip(cols + dy, 0, n - 1)
+            next_state[:, a] = new_rows * n + new_cols
+        
+        # Un mouvement contre un bord laisse l'agent sur place avec une pénalité
+        reward = self.transition_rewards(self.grid.ravel(), next_state)
+        
+        terminal = self.terminal_mask.ravel().copy()
+        
+        return next_state, reward, terminal
+   
     def step(self, action):
+        # Glissement éventuel vers une direction perpendiculaire
+        if self.success_prob < 1.0:
+            u = self.rng.random()
+            if u >= self.success_prob:
+                action = self.perpendicular[action][0 if u < (1.0 + self.success_prob) / 2 else 1]
+        
         x, y = self.state
         
         # Calcul du nouvel état en fonction de l'action
@@ -52,7 +465,7 @@ class FrozenLake:
         # Vérifier si l'agent a atteint un bord
         if (new_x == x and new_y == y):
             # L'agent a atteint un bord, pénalité modérée
-            reward = -10  # Pénalité pour avoir atteint un bord
+            reward = self.rewards['wall']  # Pénalité pour avoir atteint un bord
             done = False
         else:
             # Mise à jour de l'état
@@ -62,6 +475,6 @@ class FrozenLake:
             reward = self.grid[new_x, new_y]
             
             # Vérification si l'épisode est terminé
-            done = (self.state == self.goal) or (self.state in self.traps)
+            done = self.state in self.terminal_set
         
         return self.state, reward, done
\ No newline at end of file
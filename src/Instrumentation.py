@@ -0,0 +1,99 @@
+import contextlib
+import json
+import time
+
+class Instrumentation:
+    """
+    Compteurs et chronomètres par phase d'un algorithme, exposés après chaque exécution
+    via l'attribut `stats` (ValueIteration, PolicyIteration, QLearning).
+
+    Les compteurs (balayages, mises à jour d'état, pas d'environnement...) sont toujours
+    renseignés: ils sont calculés une fois par exécution. Les chronomètres ne sont actifs
+    qu'avec enabled=True; sinon phase() retourne un contexte vide partagé et les boucles
+    ne testent qu'un booléen.
+    """
+    def __init__(self, enabled=False):
+        """
+        Args:
+            enabled: Mesurer le temps passé dans chaque phase
+        """
+        self.enabled = enabled
+        self.counters = {}
+        self.timers = {}
+
+    def reset(self):
+        """
+        Remet compteurs et chronomètres à zéro (appelé au début de chaque exécution).
+        """
+        self.counters = {}
+        self.timers = {}
+
+    def count(self, name, n=1):
+        """
+        Incrémente le compteur name de n.
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name, seconds):
+        """
+        Ajoute une durée (en secondes) au chronomètre name.
+        """
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def phase(self, name):
+        """
+        Contexte chronométrant son bloc dans le chronomètre name (sans effet si désactivé).
+
+        Exemple:
+            with self.stats.phase('evaluation'):
+                delta = self.policy_evaluation()
+        """
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def to_dict(self):
+        """
+        Retourne les compteurs et chronomètres sous forme de dictionnaire sérialisable.
+        """
+        return {'counters': dict(self.counters), 'timers': dict(self.timers)}
+
+    def to_json(self, path=None, indent=2):
+        """
+        Exporte les mesures en JSON.
+
+        Args:
+            path: Fichier de sortie (None pour retourner seulement la chaîne)
+            indent: Indentation du JSON
+
+        Returns:
+            text: Les mesures au format JSON
+        """
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def __repr__(self):
+        return f"Instrumentation(counters={self.counters}, timers={self.timers})"
+
+class _Phase:
+    """
+    Chronomètre d'un bloc `with`.
+    """
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+_NO_PHASE = contextlib.nullcontext()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from collections import deque
+
+import numpy as np
+from src.FrozenLake import FrozenLake
+
+# Cartes déjà générées, indexées par le hachage de leurs paramètres
+_cache = {}
+
+def generate_layouts(n_maps, grid_size, hole_density=0.2, seed=None, n_goals=1, start=None,
+                     cache_dir=None):
+    """
+    Génère des cartes FrozenLake aléatoires garanties solubles (au moins un but
+    accessible depuis le départ sans traverser de trou).
+
+    Les trous et les buts sont tirés pour tout un lot de cartes à la fois; la
+    solubilité est vérifiée par un parcours par carte et les cartes insolubles
+    sont retirées puis remplacées.
+
+    Args:
+        n_maps: Nombre de cartes à générer
+        grid_size: Taille des grilles
+        hole_density: Probabilité qu'une case soit un trou
+        seed: Graine ou np.random.Generator; une graine entière met le résultat en cache
+        n_goals: Nombre de buts par carte
+        start: Case de départ (par défaut: coin inférieur droit)
+        cache_dir: Dossier optionnel où conserver les cartes générées (fichiers .npy)
+
+    Returns:
+        layouts: Tableau (n_maps, grid_size, grid_size) de codes FrozenLake
+            (FROZEN, HOLE, GOAL, START), en lecture seule
+    """
+    if start is None:
+        start = (grid_size - 1, grid_size - 1)
+    if not 0 < n_goals < grid_size ** 2:
+        raise ValueError(f"Nombre de buts invalide: {n_goals}")
+
+    key = None
+    # Seule une graine entière identifie le résultat: un Generator n'est pas mis en cache
+    if isinstance(seed, (int, np.integer)):
+        params = [int(n_maps), int(grid_size), float(hole_density), int(seed), int(n_goals),
+                  [int(start[0]), int(start[1])]]
+        key = hashlib.sha1(json.dumps(params).encode()).hexdigest()
+        if key in _cache:
+            return _cache[key]
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"{key}.npy")
+            if os.path.exists(path):
+                layouts = np.load(path)
+                layouts.setflags(write=False)
+                _cache[key] = layouts
+                return layouts
+
+    rng = np.random.default_rng(seed)
+    start_index = start[0] * grid_size + start[1]
+    accepted = []
+    n_accepted = 0
+
+    while n_accepted < n_maps:
+        batch = n_maps - n_accepted
+        layouts = np.where(rng.random((batch, grid_size, grid_size)) < hole_density,
+                           FrozenLake.HOLE, FrozenLake.FROZEN).astype(np.int8)
+        flat = layouts.reshape(batch, -1)
+
+        # Buts: les n_goals cases de plus petite clé aléatoire, hors case de départ
+        keys = rng.random((batch, grid_size ** 2))
+        keys[:, start_index] = np.inf
+        goals = np.argpartition(keys, n_goals - 1, axis=1)[:, :n_goals]
+        flat[np.arange(batch)[:, None], goals] = FrozenLake.GOAL
+        flat[:, start_index] = FrozenLake.START
+
+        solvable = np.array([is_solvable(layout) for layout in layouts], dtype=bool)
+        accepted.append(layouts[solvable])
+        n_accepted += np.count_nonzero(solvable)
+
+    layouts = np.concatenate(accepted)[:n_maps]
+    layouts.setflags(write=False)
+
+    if key is not None:
+        _cache[key] = layouts
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.save(os.path.join(cache_dir, f"{key}.npy"), layouts)
+    return layouts
+
+def generate_lakes(n_maps, grid_size, **options):
+    """
+    Génère des environnements FrozenLake garantis solubles.
+    Les options sont celles de generate_layouts.
+
+    Returns:
+        lakes: Liste d'environnements FrozenLake
+    """
+    return [FrozenLake.from_layout(layout) for layout in generate_layouts(n_maps, grid_size, **options)]
+
+def is_solvable(layout):
+    """
+    Indique si un but est accessible depuis le départ sans traverser de trou.
+
+    Args:
+        layout: Carte (grid_size, grid_size) de codes FrozenLake
+    """
+    passable = layout != FrozenLake.HOLE
+    start = tuple(np.argwhere(layout == FrozenLake.START)[0])
+
+    try:
+        # Importé ici: scipy ne ralentit pas l'import du module
+        from scipy import ndimage
+    except ImportError:  # scipy est optionnel: parcours en largeur Python sinon
+        ndimage = None
+
+    if ndimage is not None:
+        # Composantes connexes (4-voisinage) des cases praticables
+        labels, _ = ndimage.label(passable)
+        return bool(np.any(labels[layout == FrozenLake.GOAL] == labels[start]))
+
+    # Parcours en largeur depuis le départ
+    n = layout.shape[0]
+    seen = np.zeros_like(passable)
+    seen[start] = True
+    queue = deque([start])
+    while queue:
+        i, j = queue.popleft()
+        if layout[i, j] == FrozenLake.GOAL:
+            return True
+        for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= ni < n and 0 <= nj < n and passable[ni, nj] and not seen[ni, nj]:
+                seen[ni, nj] = True
+                queue.append((ni, nj))
+    return False
@@ -0,0 +1,118 @@
+import numpy as np
+
+class Policy:
+    """
+    Politique déterministe compilée: un indice d'action int8 par état (-1 pour les états
+    sans action, comme les états terminaux d'une politique issue de ValueIteration).
+    Les états sont indexés par s = i * grid_size + j et les actions par leur position
+    dans actions.
+
+    act() répond pour tout un lot de positions en un seul appel vectorisé. L'objet ne
+    référence ni l'environnement ni l'algorithme: il se sérialise (pickle) en quelques
+    octets par état et se transmet tel quel à d'autres processus.
+    """
+    __slots__ = ('table', 'grid_size', 'actions')
+
+    def __init__(self, table, grid_size, actions):
+        """
+        Args:
+            table: Tableau (grid_size ** 2,) d'indices d'actions (un np.memmap est conservé sans copie)
+            grid_size: Taille de la grille
+            actions: Noms des actions, dans l'ordre des indices
+        """
+        if not isinstance(table, np.ndarray) or table.dtype != np.int8:
+            table = np.ascontiguousarray(table, dtype=np.int8)
+        if table.shape != (grid_size ** 2,):
+            raise ValueError(f"Politique de forme {table.shape}, attendue {(grid_size ** 2,)}")
+        self.table = table
+        self.grid_size = grid_size
+        self.actions = tuple(actions)
+
+    @classmethod
+    def from_q(cls, q, grid_size, actions):
+        """
+        Politique gloutonne d'un tableau de valeurs d'action (S, A)
+        (première meilleure action en cas d'égalité).
+        """
+        return cls(np.asarray(q).argmax(axis=1), grid_size, actions)
+
+    @classmethod
+    def from_dict(cls, policy, grid_size, actions):
+        """
+        Compile une politique sous forme de dictionnaire: {(i, j): action} (PolicyIteration)
+        ou {(i, j): {action: probabilité}} (ValueIteration, QLearning.get_policy).
+        Les états absents ou sans action de probabilité non nulle reçoivent -1.
+        """
+        index = {action: a for a, action in enumerate(actions)}
+        table = np.full(grid_size ** 2, -1, dtype=np.int8)
+        for (i, j), choice in policy.items():
+            if isinstance(choice, dict):
+                # Probabilités par action: action de plus forte probabilité, s'il y en a une
+                best = max(actions, key=lambda action: choice[action])
+                if choice[best] > 0:
+                    table[i * grid_size + j] = index[best]
+            elif choice is not None:
+                table[i * grid_size + j] = index[choice]
+        return cls(table, grid_size, actions)
+
+    def act(self, positions, check=True):
+        """
+        Actions de la politique pour un lot de positions, en un appel vectorisé.
+
+        Args:
+            positions: Tableau (..., 2) de positions (i, j)
+            check: Vérifier que les positions sont dans la grille (IndexError sinon);
+                False pour des positions déjà garanties valides (sans vérification,
+                une position hors grille donnerait l'action d'une autre case)
+
+        Returns:
+            actions: Tableau (...) d'indices d'actions int8
+        """
+        positions = np.asarray(positions)
+        # Deux réductions sans tableau intermédiaire; le coupable n'est cherché qu'en cas d'erreur
+        if check and positions.size and (positions.min() < 0 or positions.max() >= self.grid_size):
+            outside = ((positions < 0) | (positions >= self.grid_size)).reshape(-1, 2).any(axis=1)
+            first = positions.reshape(-1, 2)[outside][0]
+            raise IndexError(f"Position hors de la grille {self.grid_size}x{self.grid_size}: "
+                             f"{tuple(first.tolist())}")
+        return self.table[positions[..., 0] * self.grid_size + positions[..., 1]]
+
+    def act_index(self, states, check=True):
+        """
+        Actions de la politique pour un lot d'indices d'états s = i * grid_size + j
+        (check: vérifier que 0 <= s < grid_size ** 2, voir act).
+        """
+        states = np.asarray(states)
+        if check and states.size and (states.min() < 0 or states.max() >= len(self.table)):
+            raise IndexError(f"Indice d'état hors de [0, {len(self.table)})")
+        return self.table[states]
+
+    def action(self, state):
+        """
+        Nom de l'action dans l'état (i, j) (None si aucune action).
+        """
+        i, j = state
+        if not (0 <= i < self.grid_size and 0 <= j < self.grid_size):
+            raise KeyError(state)
+        a = int(self.table[i * self.grid_size + j])
+        return self.actions[a] if a >= 0 else None
+
+    def __getitem__(self, state):
+        return self.action(state)
+
+    def __len__(self):
+        return len(self.table)
+
+    def __eq__(self, other):
+        return (isinstance(other, Policy) and self.grid_size == other.grid_size
+                and self.actions == other.actions and np.array_equal(self.table, other.table))
+
+    def __getstate__(self):
+        # Copie contiguë: une politique projetée en mémoire (np.memmap) est transmise par valeur
+        return np.ascontiguousarray(self.table), self.grid_size, self.actions
+
+    def __setstate__(self, state):
+        self.table, self.grid_size, self.actions = state
+
+    def __repr__(self):
+        return f"Policy(grid_size={self.grid_size}, actions={self.actions})"
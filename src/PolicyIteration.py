@@ -1,8 +1,33 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from src.Callbacks import hook, make_callback
+from src.Instrumentation import Instrumentation
+from src.Policy import Policy
+
+_scipy = None
+
+def _load_scipy():
+    """
+    Importe scipy.sparse à la demande: seule l'évaluation 'linear' en a besoin, et son
+    import coûte plus de 100 ms.
+    
+    Returns:
+        sp, spla: Les modules scipy.sparse et scipy.sparse.linalg (None si scipy est absent)
+    """
+    global _scipy
+    if _scipy is None:
+        try:
+            import scipy.sparse as sp
+            import scipy.sparse.linalg as spla
+            _scipy = (sp, spla)
+        except ImportError:  # scipy est optionnel: l'évaluation par balayage reste disponible
+            _scipy = (None, None)
+    return _scipy
 
 class PolicyIteration:
-    def __init__(self, env, gamma=0.9, theta=1e-6):
+    EVALUATIONS = ('sweep', 'linear')
+    
+    def __init__(self, env, gamma=0.9, theta=1e-6, evaluation='sweep', max_eval_sweeps=None, seed=None, callback=None,
+                 instrument=False):
         """
         Initialise l'algorithme de Policy Iteration.
         
@@ -10,10 +35,35 @@ class PolicyIteration:
             env: L'environnement FrozenLake
             gamma: Facteur d'actualisation pour les récompenses futures
             theta: Seuil de convergence pour l'évaluation de la politique
+            evaluation: 'sweep' (balayages itératifs jusqu'à theta) ou 'linear'
+                (résolution directe du système creux (I - gamma * P_pi) V = r_pi,
+                nécessite scipy; sinon retour au mode 'sweep')
+            max_eval_sweeps: Nombre maximum de balayages d'évaluation par étape
+                d'amélioration (Policy Iteration modifiée, mode 'sweep').
+                None pour évaluer la politique jusqu'à convergence
+            seed: Graine ou np.random.Generator utilisé pour la politique initiale
+            callback: Callback notifié à chaque itération et à la convergence
+                (None: ProgressLogger; Callback() pour n'afficher rien)
+            instrument: Chronométrer l'évaluation et l'amélioration dans self.stats;
+                les compteurs sont toujours renseignés
         """
+        if evaluation not in self.EVALUATIONS:
+            raise ValueError(f"Mode d'évaluation inconnu: {evaluation!r} (attendu: {self.EVALUATIONS})")
+        if max_eval_sweeps is not None and (not isinstance(max_eval_sweeps, (int, np.integer))
+                                            or isinstance(max_eval_sweeps, bool) or max_eval_sweeps < 1):
+            raise ValueError(f"max_eval_sweeps doit être None ou un entier >= 1: {max_eval_sweeps!r}")
         self.env = env
         self.gamma = gamma
         self.theta = theta
+        self.evaluation = evaluation
+        self.max_eval_sweeps = max_eval_sweeps
+        self.rng = np.random.default_rng(seed)
+        self.callback = make_callback(callback)
+        
+        # Compteurs du dernier appel à run
+        self.iterations = 0
+        self.eval_sweeps = 0
+        self.stats = Instrumentation(enabled=instrument)
         self.states = [(i, j) for i in range(env.grid_size) for j in range(env.grid_size)]
         self.n_states = env.grid_size * env.grid_size
         self.n_actions = len(env.actions)
@@ -23,7 +73,8 @@ class PolicyIteration:
         self.V = {state: 0 for state in self.states}
         
         # Initialisation de la politique à des actions aléatoires
-        self.policy = {state: np.random.choice(self.actions) for state in self.states}
+        initial_actions = self.rng.integers(self.n_actions, size=self.n_states)
+        self.policy = {state: self.actions[a] for state, a in zip(self.states, initial_actions)}
         
         # Initialisation de la Q-table
         self.Q = {state: {action: 0 for action in self.actions} for state in self.states}
@@ -31,37 +82,74 @@ class PolicyIteration:
     def policy_evaluation(self):
         """
         Évalue la politique actuelle en calculant la fonction valeur.
+        Les valeurs courantes servent de point de départ (warm start) et au plus
+        max_eval_sweeps balayages sont effectués.
+        
+        Returns:
+            delta: Variation maximale lors du dernier balayage (0 en mode 'linear')
         """
+        if self.env.is_slippery:
+            return self._sparse_evaluation()
+        if self.evaluation == 'linear' and _load_scipy()[0] is not None:
+            self._linear_evaluation()
+            return 0.0
+        
         delta = float('inf')
+        sweeps = 0
+        next_state, reward, terminal = self.env.get_transition_model()
+        next_state, reward, terminal = next_state.tolist(), reward.tolist(), terminal.tolist()
+        action_index = {action: a for a, action in enumerate(self.actions)}
         
-        while delta > self.theta:
+        while delta > self.theta and (self.max_eval_sweeps is None or sweeps < self.max_eval_sweeps):
             delta = 0
+            sweeps += 1
+            self.eval_sweeps += 1
             
-            for state in self.states:
+            for s, state in enumerate(self.states):
                 old_value = self.V[state]
                 
                 # Si l'état est terminal (trou ou objectif), sa valeur reste à 0
-                if state == self.env.goal or state in self.env.traps:
+                if terminal[s]:
                     self.V[state] = self.env.grid[state]
                     continue
                 
-                action = self.policy[state]
-                new_value = 0
-                
-                # Sauvegarde de l'état actuel de l'environnement
-                old_state = self.env.state
-                self.env.state = state
-                
-                next_state, reward, done = self.env.step(action)
+                a = action_index[self.policy[state]]
+                ns = next_state[s][a]
                 
                 # Mise à jour de la valeur de l'état
-                new_value = reward + self.gamma * self.V[next_state] * (not done)
-                
-                # Restauration de l'état de l'environnement
-                self.env.state = old_state
+                new_value = reward[s][a] + self.gamma * self.V[self.states[ns]] * (not terminal[ns])
                 
                 self.V[state] = new_value
                 delta = max(delta, abs(old_value - new_value))
+        
+        return delta
+    
+    def _linear_evaluation(self):
+        """
+        Évalue la politique actuelle exactement en résolvant le système linéaire
+        creux (I - gamma * P_pi) V = r_pi. L'environnement étant déterministe,
+        chaque ligne de P_pi contient au plus un coefficient non nul.
+        Les états terminaux gardent leur récompense comme valeur, comme en mode 'sweep'.
+        """
+        sp, spla = _load_scipy()
+        next_state, reward, terminal = self.env.get_transition_model()
+        action_index = {action: a for a, action in enumerate(self.actions)}
+        
+        states = np.arange(self.n_states)
+        pi = np.array([action_index[self.policy[state]] for state in self.states])
+        ns = next_state[states, pi]
+        
+        # Seules les transitions d'un état non terminal vers un état non terminal sont actualisées
+        linked = ~terminal & ~terminal[ns]
+        P_pi = sp.csr_matrix(
+            (np.full(np.count_nonzero(linked), self.gamma), (states[linked], ns[linked])),
+            shape=(self.n_states, self.n_states)
+        )
+        A = sp.identity(self.n_states, format='csr') - P_pi
+        b = np.where(terminal, self.env.grid.ravel(), reward[states, pi])
+        
+        V = spla.spsolve(A.tocsc(), b)
+        self.V = dict(zip(self.states, V.tolist()))
     
     def policy_improvement(self):
         """
@@ -70,32 +158,30 @@ class PolicyIteration:
         Returns:
             bool: True si la politique a été modifiée, False sinon
         """
+        if self.env.is_slippery:
+            return self._sparse_improvement()
+        
         policy_stable = True
+        next_state, reward, terminal = self.env.get_transition_model()
+        next_state, reward, terminal = next_state.tolist(), reward.tolist(), terminal.tolist()
         
-        for state in self.states:
+        for s, state in enumerate(self.states):
             # Si l'état est terminal, pas besoin de mettre à jour la politique
-            if state == self.env.goal or state in self.env.traps:
+            if terminal[s]:
                 continue
             
             old_action = self.policy[state]
             
             # Calcul des valeurs Q pour chaque action
             q_values = {}
-            for action in self.actions:
-                # Sauvegarde de l'état actuel de l'environnement
-                old_state = self.env.state
-                self.env.state = state
-                
-                next_state, reward, done = self.env.step(action)
+            for a, action in enumerate(self.actions):
+                ns = next_state[s][a]
                 
                 # Calcul de la valeur Q pour cette action
-                q_values[action] = reward + self.gamma * self.V[next_state] * (not done)
+                q_values[action] = reward[s][a] + self.gamma * self.V[self.states[ns]] * (not terminal[ns])
                 
                 # Mise à jour de la Q-table
                 self.Q[state][action] = q_values[action]
-                
-                # Restauration de l'état de l'environnement
-                self.env.state = old_state
             
             # Choisir l'action qui maximise la valeur Q
             best_action = max(q_values, key=q_values.get)
@@ -107,30 +193,129 @@ class PolicyIteration:
         
         return policy_stable
     
-    def run(self, max_iterations=1000):
+    def _sparse_model(self):
+        """
+        Modèle stochastique de l'environnement et valeurs courantes sous forme de tableaux.
+        Les états terminaux valent 0 dans les backups (leur récompense est perçue en y entrant).
+        """
+        if _load_scipy()[0] is None:
+            raise ImportError("scipy est nécessaire pour une dynamique avec glissements")
+        P, reward, terminal = self.env.get_sparse_model()
+        V = np.array([self.V[state] for state in self.states], dtype=np.float64)
+        V[terminal] = 0.0
+        return P, reward, terminal, V
+    
+    def _policy_indices(self):
+        """
+        Politique courante sous forme de tableau (S,) d'indices d'actions.
+        """
+        action_index = {action: a for a, action in enumerate(self.actions)}
+        return np.array([action_index[self.policy[state]] for state in self.states])
+    
+    def _sparse_evaluation(self):
+        """
+        Évaluation de la politique pour une dynamique avec glissements: les backups espérés
+        V = r_pi + gamma * P_pi @ V sont des produits matrice creuse-vecteur, où P_pi regroupe
+        les lignes de P des actions choisies (mode 'sweep'), ou le système
+        (I - gamma * P_pi) V = r_pi est résolu directement (mode 'linear').
+        
+        Returns:
+            delta: Variation maximale lors du dernier balayage (0 en mode 'linear')
+        """
+        sp, spla = _load_scipy()
+        P, reward, terminal, V = self._sparse_model()
+        states = np.arange(self.n_states)
+        pi = self._policy_indices()
+        P_pi = (self.gamma * P[states * self.n_actions + pi]).tocsr()
+        r_pi = reward[states, pi]
+        
+        delta = 0.0
+        if self.evaluation == 'linear':
+            V = spla.spsolve((sp.identity(self.n_states, format='csr') - P_pi).tocsc(), r_pi)
+        else:
+            delta = float('inf')
+            sweeps = 0
+            while delta > self.theta and (self.max_eval_sweeps is None or sweeps < self.max_eval_sweeps):
+                V_new = r_pi + P_pi @ V
+                delta = np.abs(V_new - V).max()
+                V = V_new
+                sweeps += 1
+                self.eval_sweeps += 1
+        
+        # Comme en mode déterministe, les états terminaux affichent leur récompense
+        V = np.where(terminal, self.env.grid.ravel(), V)
+        self.V = dict(zip(self.states, V.tolist()))
+        return delta
+    
+    def _sparse_improvement(self):
+        """
+        Amélioration de la politique pour une dynamique avec glissements:
+        Q = R + gamma * (P @ V) en un produit matrice creuse-vecteur.
+        
+        Returns:
+            bool: True si la politique est stable, False sinon
+        """
+        P, reward, terminal, V = self._sparse_model()
+        Q = reward + self.gamma * (P @ V).reshape(self.n_states, self.n_actions)
+        
+        old = self._policy_indices()
+        best = np.where(terminal, old, Q.argmax(axis=1))
+        self.policy = {state: self.actions[a] for state, a in zip(self.states, best.tolist())}
+        self.Q = {state: dict(zip(self.actions, row)) for state, row in zip(self.states, Q.tolist())}
+        return bool(np.array_equal(best, old))
+    
+    def run(self, max_iterations=1000, initial_policy=None, initial_V=None):
         """
         Exécute l'algorithme de Policy Iteration.
+        La fonction valeur est conservée d'une itération à l'autre (warm start).
         
         Args:
             max_iterations: Nombre maximum d'itérations
+            initial_policy: Politique de départ optionnelle, par exemple issue d'une
+                résolution précédente ({état: action} ou format de get_policy)
+            initial_V: Fonction valeur de départ optionnelle ({état: valeur})
             
         Returns:
             dict: La politique optimale
         """
+        if initial_policy is not None:
+            for state, action in initial_policy.items():
+                if isinstance(action, dict):
+                    action = max(action, key=action.get)
+                self.policy[state] = action
+        if initial_V is not None:
+            self.V.update(initial_V)
+        
+        self.iterations = 0
+        self.eval_sweeps = 0
+        self.stats.reset()
+        on_iteration = hook(self.callback, 'on_iteration')
         for i in range(max_iterations):
-            # Évaluation de la politique
-            self.policy_evaluation()
+            self.iterations = i + 1
+            
+            # Évaluation de la politique (éventuellement tronquée)
+            with self.stats.phase('evaluation'):
+                delta = self.policy_evaluation()
             
             # Amélioration de la politique
-            policy_stable = self.policy_improvement()
+            with self.stats.phase('improvement'):
+                policy_stable = self.policy_improvement()
             
-            print(f"Itération {i+1} terminée")
+            if on_iteration is not None:
+                on_iteration(self, i + 1, delta)
             
-            # Si la politique est stable, on a convergé
-            if policy_stable:
-                print(f"Politique stable après {i+1} itérations")
+            # Si la politique est stable (et les valeurs convergées en mode modifié), on a convergé
+            if policy_stable and delta <= self.theta:
+                self.callback.on_converged(self, i + 1, delta)
                 break
         
+        # Compteurs: mises à jour d'état des balayages d'évaluation (ou résolutions linéaires)
+        # et évaluations d'actions des étapes d'amélioration
+        self.stats.count('iterations', self.iterations)
+        self.stats.count('eval_sweeps', self.eval_sweeps)
+        self.stats.count('linear_solves', self.iterations if self.evaluation == 'linear' and _load_scipy()[0] is not None else 0)
+        self.stats.count('backups', self.eval_sweeps * self.n_states)
+        self.stats.count('action_evaluations', self.iterations * self.n_states * self.n_actions)
         return self.policy
     
     def get_policy(self):
@@ -146,6 +331,16 @@ class PolicyIteration:
             policy_prob[state][self.policy[state]] = 1.0
         return policy_prob
     
+    def compile_policy(self):
+        """
+        Compile la politique courante en Policy (un indice d'action int8 par état),
+        pour des requêtes par lots.
+        
+        Returns:
+            policy: La politique compilée
+        """
+        return Policy.from_dict(self.policy, self.env.grid_size, self.actions)
+    
     def get_value_function(self):
         """
         Retourne la fonction de valeur d'état.
@@ -182,9 +377,9 @@ class PolicyIteration:
         for i in range(self.env.grid_size):
             for j in range(self.env.grid_size):
                 state = (i, j)
-                if state == self.env.goal:
+                if state in self.env.goal_set:
                     policy_grid[i, j] = 'G'  # Goal
-                elif state in self.env.traps:
+                elif state in self.env.trap_set:
                     policy_grid[i, j] = 'H'  # Hole
                 else:
                     policy_grid[i, j] = action_arrows[self.policy[state]]
@@ -204,6 +399,7 @@ class PolicyIteration:
         Returns:
             trajectory: Liste de tuples (état, action, récompense)
         """
+        policy = self.compile_policy()
         state = self.env.reset()
         trajectory = []
         done = False
@@ -211,7 +407,7 @@ class PolicyIteration:
         
         while not done and steps < max_steps:
             # Choisir la meilleure action selon la politique actuelle
-            action = self.policy[state]
+            action = policy.action(state)
             
             # Effectuer l'action
             next_state, reward, done = self.env.step(action)
@@ -232,6 +428,7 @@ class PolicyIteration:
         """
         Affiche la fonction valeur sous forme de heatmap.
         """
+        import matplotlib.pyplot as plt  # import à la demande: la résolution n'en dépend pas
         value_grid = np.zeros((self.env.grid_size, self.env.grid_size))
         for i in range(self.env.grid_size):
             for j in range(self.env.grid_size):
@@ -253,6 +450,7 @@ class PolicyIteration:
         """
         Visualise la politique sous forme de heatmap colorée.
         """
+        import matplotlib.pyplot as plt
         # Conversion des actions en flèches pour une meilleure visualisation
         action_arrows = {
             'up': '↑',
@@ -265,9 +463,9 @@ class PolicyIteration:
         for i in range(self.env.grid_size):
             for j in range(self.env.grid_size):
                 state = (i, j)
-                if state == self.env.goal:
+                if state in self.env.goal_set:
                     policy_grid[i, j] = 'G'  # Goal
-                elif state in self.env.traps:
+                elif state in self.env.trap_set:
                     policy_grid[i, j] = 'H'  # Hole
                 else:
                     policy_grid[i, j] = action_arrows[self.policy[state]]
@@ -287,9 +485,9 @@ class PolicyIteration:
         for i in range(self.env.grid_size):
             for j in range(self.env.grid_size):
                 state = (i, j)
-                if state == self.env.goal:
+                if state in self.env.goal_set:
                     policy_color_grid[i, j] = action_codes['G']
-                elif state in self.env.traps:
+                elif state in self.env.trap_set:
                     policy_color_grid[i, j] = action_codes['H']
                 else:
                     policy_color_grid[i, j] = action_codes[self.policy[state]]
@@ -0,0 +1,77 @@
+import numpy as np
+from collections.abc import Mapping
+
+class QTable(Mapping):
+    """
+    Q-table compacte stockée dans un tableau NumPy contigu de forme (S, A).
+    Les états sont indexés par s = i * grid_size + j et les actions par leur
+    position dans env.actions.
+
+    La table se comporte aussi comme un dictionnaire en lecture seule
+    {état: {action: valeur}}, ce qui permet de la passer telle quelle à Affichage.
+    """
+    def __init__(self, env, dtype=np.float64):
+        """
+        Args:
+            env: L'environnement FrozenLake
+            dtype: Type des valeurs (np.float32 ou np.float64)
+        """
+        self.grid_size = env.grid_size
+        self.actions = list(env.actions)
+        self.action_index = {action: a for a, action in enumerate(self.actions)}
+        self.values = np.zeros((self.grid_size ** 2, len(self.actions)), dtype=dtype)
+
+    def index(self, state):
+        """
+        Convertit un état (i, j) en indice de ligne.
+        """
+        i, j = state
+        if not (0 <= i < self.grid_size and 0 <= j < self.grid_size):
+            raise KeyError(state)
+        return i * self.grid_size + j
+
+    def state(self, index):
+        """
+        Convertit un indice de ligne en état (i, j).
+        """
+        return divmod(int(index), self.grid_size)
+
+    def __getitem__(self, state):
+        return _QRow(self, self.index(state))
+
+    def __iter__(self):
+        for s in range(len(self.values)):
+            yield divmod(s, self.grid_size)
+
+    def __len__(self):
+        return len(self.values)
+
+    def as_dict(self):
+        """
+        Copie la table dans un dictionnaire {état: {action: valeur}}.
+        """
+        return {divmod(s, self.grid_size): dict(zip(self.actions, row))
+                for s, row in enumerate(self.values.tolist())}
+
+
+class _QRow(Mapping):
+    """
+    Vue en lecture seule d'une ligne de la Q-table: {action: valeur}.
+    """
+    __slots__ = ('_table', '_s')
+
+    def __init__(self, table, s):
+        self._table = table
+        self._s = s
+
+    def __getitem__(self, action):
+        return float(self._table.values[self._s, self._table.action_index[action]])
+
+    def __iter__(self):
+        return iter(self._table.actions)
+
+    def __len__(self):
+        return len(self._table.actions)
+
+    def __repr__(self):
+        return repr(dict(self))
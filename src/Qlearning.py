@@ -1,8 +1,17 @@
+import time
 import numpy as np
-import random
+from src.Callbacks import hook, make_callback
+from src.Checkpoint import CheckpointWriter, decode_state, encode_state, load_checkpoint
+from src.Instrumentation import Instrumentation
+from src.Policy import Policy
+from src.QTable import QTable
+from src.TrainingStats import TrainingStats
+from src.VectorFrozenLake import VectorFrozenLake
 
 class QLearning:
-    def __init__(self, env, alpha=0.1, gamma=0.99, epsilon=0.1):
+    def __init__(self, env, alpha=0.1, gamma=0.99, epsilon=0.1, dtype=np.float64, seed=None, random_block=4096,
+                 stats_window=100, history_size=1000, callback=None,
+                 instrument=False):
         """
         Initialise l'algorithme Q-Learning.
         
@@ -11,17 +20,50 @@ class QLearning:
             alpha: Taux d'apprentissage
             gamma: Facteur de dépréciation
             epsilon: Probabilité d'exploration
+            dtype: Type des valeurs de la Q-table (np.float32 ou np.float64)
+            seed: Graine ou np.random.Generator; seule source d'aléa de l'agent
+            random_block: Nombre de tirages uniformes générés d'un coup pour la
+                boucle d'entraînement (évite un appel au générateur par étape)
+            stats_window: Fenêtre des moyennes mobiles de self.training_stats
+            history_size: Nombre de points de l'historique sous-échantillonné de self.training_stats
+            callback: Callback notifié à la fin de chaque épisode
+                (None: ProgressLogger; Callback() pour n'afficher rien)
+            instrument: Chronométrer les phases de l'entraînement dans self.stats
+                (choix d'action, pas d'environnement, mise à jour); les compteurs
+                sont toujours renseignés
         """
         self.env = env
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.callback = make_callback(callback)
         
-        # Initialisation de la Q-table
-        self.Q = {}
-        for i in range(self.env.grid_size):
-            for j in range(self.env.grid_size):
-                self.Q[(i, j)] = {action: 0.0 for action in self.env.actions}
+        # Initialisation de la Q-table: tableau (S, A), vue dictionnaire via self.Q[état][action]
+        self.Q = QTable(env, dtype=dtype)
+        self.n_actions = len(self.env.actions)
+        
+        # Générateur aléatoire propre à l'agent et tampon de tirages uniformes
+        self.rng = np.random.default_rng(seed)
+        self.random_block = random_block
+        self._uniforms = []
+        self._uniform_pos = 0
+        
+        # Statistiques d'apprentissage en flux, cumulées sur tous les appels à train
+        self.training_stats = TrainingStats(window=stats_window, history_size=history_size)
+        
+        # Compteurs et chronomètres du dernier appel à train ou train_batch
+        self.stats = Instrumentation(enabled=instrument)
+    
+    def _uniform(self):
+        """
+        Retourne le prochain tirage uniforme sur [0, 1), tiré par blocs de random_block.
+        """
+        if self._uniform_pos >= len(self._uniforms):
+            self._uniforms = self.rng.random(self.random_block).tolist()
+            self._uniform_pos = 0
+        u = self._uniforms[self._uniform_pos]
+        self._uniform_pos += 1
+        return u
     
     def choose_action(self, state):
         """
@@ -34,14 +76,25 @@ class QLearning:
         Returns:
             L'action choisie
         """
-        if random.uniform(0, 1) < self.epsilon:
-            # Exploration: action aléatoire
-            return random.choice(self.env.actions)
+        return self.env.actions[self._choose_action(self.Q.index(state))]
+    
+    def _choose_action(self, s):
+        """
+        Politique epsilon-greedy sur les indices entiers (état s, action a).
+        """
+        u = self._uniform()
+        if u < self.epsilon:
+            # Exploration: action aléatoire (u / epsilon est uniforme sur [0, 1))
+            return int(u / self.epsilon * self.n_actions)
         else:
             # Exploitation: meilleure action connue
-            max_q = max(self.Q[state].values())
-            best_actions = [action for action, q_value in self.Q[state].items() if q_value == max_q]
-            return random.choice(best_actions)
+            # (tolist() sur une ligne de A valeurs est bien moins coûteux que des opérations NumPy scalaires)
+            row = self.Q.values[s].tolist()
+            max_q = max(row)
+            if row.count(max_q) == 1:
+                return row.index(max_q)
+            best_actions = [a for a, q_value in enumerate(row) if q_value == max_q]
+            return best_actions[int(self._uniform() * len(best_actions))]
     
     def update(self, state, action, reward, next_state, done):
         """
@@ -54,64 +107,287 @@ class QLearning:
             next_state: L'état suivant
             done: Indique si l'épisode est terminé
         """
+        self._update(self.Q.index(state), self.Q.action_index[action], reward,
+                     self.Q.index(next_state), done)
+    
+    def _update(self, s, a, reward, ns, done):
+        """
+        Mise à jour de Bellman sur les indices entiers.
+        """
+        q = self.Q.values
+        
         # Calcul de la valeur cible pour la mise à jour
         if done:
             # Pas d'état suivant si l'épisode est terminé
             max_next_q = 0
         else:
             # Prendre la meilleure action possible pour l'état suivant
-            max_next_q = max(self.Q[next_state].values())
+            max_next_q = max(q[ns].tolist())
         
         # Calcul de l'erreur de prédiction (delta)
-        delta = reward + self.gamma * max_next_q - self.Q[state][action]
+        q_sa = q[s, a]
+        delta = reward + self.gamma * max_next_q - q_sa
         
         # Mise à jour de la Q-value
-        self.Q[state][action] += self.alpha * delta
+        q[s, a] = q_sa + self.alpha * delta
     
-    def train(self, episodes=1000):
+    def checkpoint_state(self, episode):
+        """
+        Copie l'état complet de l'entraînement: Q-table, états des générateurs aléatoires
+        (agent et environnement, tirages uniformes en attente compris), compteur
+        d'épisodes et statistiques d'apprentissage. La reprise depuis cet état
+        reproduit exactement l'entraînement ininterrompu.
+        
+        Args:
+            episode: Nombre d'épisodes déjà effectués
+            
+        Returns:
+            arrays: Dictionnaire {nom: tableau}, indépendant de l'agent (voir Checkpoint)
+        """
+        arrays = {
+            'Q': self.Q.values.copy(),
+            'episode': np.int64(episode),
+            'rng_state': encode_state(self.rng.bit_generator.state),
+            'uniforms': np.array(self._uniforms[self._uniform_pos:], dtype=np.float64),
+        }
+        env_rng = getattr(self.env, 'rng', None)
+        if env_rng is not None:
+            arrays['env_rng_state'] = encode_state(env_rng.bit_generator.state)
+        for name, value in self.training_stats.get_state().items():
+            arrays[f'stats_{name}'] = value
+        return arrays
+    
+    def load_checkpoint(self, path):
+        """
+        Restaure un point de reprise écrit pendant train (voir checkpoint_state).
+        
+        Args:
+            path: Fichier .npz du point de reprise
+            
+        Returns:
+            episode: Nombre d'épisodes effectués au moment du point de reprise
+        """
+        arrays = load_checkpoint(path)
+        if arrays['Q'].shape != self.Q.values.shape:
+            raise ValueError(f"Q-table du point de reprise de forme {arrays['Q'].shape}, "
+                             f"attendue {self.Q.values.shape}")
+        self.Q.values[...] = arrays['Q']
+        self.rng.bit_generator.state = decode_state(arrays['rng_state'])
+        self._uniforms = arrays['uniforms'].tolist()
+        self._uniform_pos = 0
+        if 'env_rng_state' in arrays and getattr(self.env, 'rng', None) is not None:
+            self.env.rng.bit_generator.state = decode_state(arrays['env_rng_state'])
+        self.training_stats.set_state({name[len('stats_'):]: value for name, value in arrays.items()
+                                       if name.startswith('stats_')})
+        return int(arrays['episode'])
+    
+    def train(self, episodes=1000, keep_history=True, checkpoint=None, checkpoint_every=10000,
+              resume_from=None):
         """
         Entraîne l'agent sur un nombre donné d'épisodes.
+        Les statistiques sont cumulées en flux dans self.training_stats.
         
         Args:
             episodes: Nombre d'épisodes d'entraînement
+            keep_history: Conserver les listes complètes par épisode; False pour
+                un entraînement long à mémoire constante (self.training_stats seul)
+            checkpoint: Fichier .npz où écrire un point de reprise tous les
+                checkpoint_every épisodes et en fin d'entraînement (None: aucun).
+                L'écriture, atomique, se fait dans un fil d'exécution dédié; la Q-table
+                est écrite dans un fichier .npy voisin, projetable en mémoire
+            checkpoint_every: Nombre d'épisodes entre deux points de reprise
+            resume_from: Point de reprise depuis lequel reprendre: seuls les épisodes
+                restants (jusqu'à episodes) sont effectués, et les listes retournées
+                ne couvrent qu'eux
             
         Returns:
-            rewards: Liste des récompenses par épisode
-            steps: Liste du nombre d'étapes par épisode
+            rewards: Liste des récompenses par épisode (None si keep_history=False)
+            steps: Liste du nombre d'étapes par épisode (None si keep_history=False)
+        """
+        first = 0 if resume_from is None else self.load_checkpoint(resume_from)
+        if checkpoint is None:
+            return self._train(first, episodes, keep_history, None, checkpoint_every)
+        
+        writer = CheckpointWriter(checkpoint, separate=('Q',))
+        try:
+            result = self._train(first, episodes, keep_history, writer, checkpoint_every)
+        except BaseException:
+            # Le dernier point de reprise est écrit si possible, sans masquer l'erreur d'origine
+            try:
+                writer.close()
+            except Exception:
+                pass
+            raise
+        writer.close()
+        return result
+    
+    def _train(self, first, episodes, keep_history, writer, checkpoint_every):
+        """
+        Boucle d'entraînement de train, des épisodes first à episodes.
         """
-        rewards = []
-        steps = []
+        stats = self.training_stats
+        on_episode_end = hook(self.callback, 'on_episode_end')
+        rewards = [] if keep_history else None
+        steps = [] if keep_history else None
+        grid_size = self.env.grid_size
         
-        for episode in range(episodes):
-            state = self.env.reset()
+        # Chronométrage par phase: un test booléen par phase quand il est désactivé
+        self.stats.reset()
+        timed = self.stats.enabled
+        clock = time.perf_counter
+        t_action = t_step = t_update = 0.0
+        total_steps = 0
+        
+        for episode in range(first, episodes):
+            s = self.Q.index(self.env.reset())
             episode_reward = 0
             episode_steps = 0
             done = False
             
             while not done:
+                if timed:
+                    t0 = clock()
+                
                 # Choisir une action
-                action = self.choose_action(state)
+                a = self._choose_action(s)
+                if timed:
+                    t1 = clock()
                 
                 # Effectuer l'action
-                next_state, reward, done = self.env.step(action)
+                next_state, reward, done = self.env.step(self.env.actions[a])
+                ns = next_state[0] * grid_size + next_state[1]
+                if timed:
+                    t2 = clock()
                 
                 # Mettre à jour la Q-table
-                self.update(state, action, reward, next_state, done)
+                self._update(s, a, reward, ns, done)
+                if timed:
+                    t3 = clock()
+                    t_action += t1 - t0
+                    t_step += t2 - t1
+                    t_update += t3 - t2
                 
                 # Mise à jour de l'état
-                state = next_state
+                s = ns
                 episode_reward += reward
                 episode_steps += 1
             
-            rewards.append(episode_reward)
-            steps.append(episode_steps)
+            total_steps += episode_steps
+            stats.add(episode_reward, episode_steps)
+            if keep_history:
+                rewards.append(episode_reward)
+                steps.append(episode_steps)
             
-            # Affichage de la progression
-            if (episode + 1) % 100 == 0:
-                print(f"Épisode {episode + 1}/{episodes}, Récompense Moyenne: {np.mean(rewards[-100:]):.2f}")
+            if on_episode_end is not None:
+                on_episode_end(self, episode + 1, episode_reward, episode_steps)
+            
+            # Point de reprise: copie de l'état, écrite en arrière-plan
+            if writer is not None and (episode + 1) % checkpoint_every == 0:
+                writer.submit(self.checkpoint_state(episode + 1))
+        
+        if writer is not None and first < episodes and episodes % checkpoint_every:
+            writer.submit(self.checkpoint_state(episodes))
+        
+        self.stats.count('episodes', max(episodes - first, 0))
+        self.stats.count('env_steps', total_steps)
+        self.stats.count('updates', total_steps)
+        if timed:
+            self.stats.add_time('action', t_action)
+            self.stats.add_time('step', t_step)
+            self.stats.add_time('update', t_update)
         
         return rewards, steps
     
+    def train_batch(self, episodes=1000, n_envs=64, max_steps=None, keep_history=True):
+        """
+        Entraîne n_envs agents epsilon-greedy en parallèle sur un VectorFrozenLake,
+        en partageant la Q-table. Les actions et les cibles TD sont calculées par lots.
+        Quand plusieurs agents visitent le même couple (état, action) au cours d'un pas,
+        leurs erreurs TD sont moyennées: le couple reçoit une seule mise à jour de pas alpha
+        (les sommer reviendrait à multiplier alpha par le nombre de visites et diverger).
+        
+        Args:
+            episodes: Nombre d'épisodes terminés à collecter (tous agents confondus)
+            n_envs: Nombre d'agents simulés simultanément
+            max_steps: Nombre maximum d'étapes par épisode (None: pas de limite);
+                un épisode tronqué est compté sans mise à jour terminale
+            keep_history: Conserver les listes complètes par épisode (voir train)
+            
+        Returns:
+            rewards: Liste des récompenses par épisode, dans l'ordre de fin (None si keep_history=False)
+            steps: Liste du nombre d'étapes par épisode (None si keep_history=False)
+        """
+        venv = VectorFrozenLake(self.env, n_envs=n_envs)
+        q = self.Q.values
+        q_flat = q.reshape(-1)  # vue sur la même mémoire
+        agents = np.arange(n_envs)
+        
+        stats = self.training_stats
+        on_episode_end = hook(self.callback, 'on_episode_end')
+        rewards = [] if keep_history else None
+        steps = [] if keep_history else None
+        episode_reward = np.zeros(n_envs)
+        episode_steps = np.zeros(n_envs, dtype=np.int64)
+        completed = 0
+        batch_steps = 0
+        self.stats.reset()
+        phase = self.stats.phase
+        
+        s = venv.reset()
+        while completed < episodes:
+            batch_steps += 1
+            with phase('action'):
+                # Actions gloutonnes, égalités départagées au hasard
+                q_s = q[s]
+                best = q_s == q_s.max(axis=1, keepdims=True)
+                a = (self.rng.random(q_s.shape) * best).argmax(axis=1)
+                
+                # Exploration
+                explore = self.rng.random(n_envs) < self.epsilon
+                a[explore] = self.rng.integers(self.n_actions, size=np.count_nonzero(explore))
+            
+            with phase('step'):
+                ns, reward, done = venv.step(a)
+            
+            with phase('update'):
+                # Cibles TD par lots, moyennées par couple (état, action) distinct
+                target = reward + self.gamma * q[ns].max(axis=1) * ~done
+                td = target - q[s, a]
+                pairs, inverse, counts = np.unique(s * self.n_actions + a, return_inverse=True, return_counts=True)
+                q_flat[pairs] += self.alpha * np.bincount(inverse, weights=td, minlength=len(pairs)) / counts
+            
+            episode_reward += reward
+            episode_steps += 1
+            
+            # Épisodes terminés (ou tronqués)
+            finished = done if max_steps is None else done | (episode_steps >= max_steps)
+            if finished.any():
+                # Les épisodes au-delà du nombre demandé ne sont pas comptés
+                ended = agents[finished][:episodes - completed]
+                ended_rewards = episode_reward[ended].tolist()
+                ended_steps = episode_steps[ended].tolist()
+                if keep_history:
+                    rewards.extend(ended_rewards)
+                    steps.extend(ended_steps)
+                
+                for reward, n_steps in zip(ended_rewards, ended_steps):
+                    stats.add(reward, n_steps)
+                    completed += 1
+                    if on_episode_end is not None:
+                        on_episode_end(self, completed, reward, n_steps)
+                
+                episode_reward[finished] = 0
+                episode_steps[finished] = 0
+                venv.reset(finished & ~done)
+            
+            s = venv.states
+        
+        self.stats.count('episodes', completed)
+        self.stats.count('batch_steps', batch_steps)
+        self.stats.count('env_steps', batch_steps * n_envs)
+        self.stats.count('updates', batch_steps * n_envs)
+        return rewards, steps
+    
     def get_policy(self):
         """
         Extrait la politique optimale à partir de la Q-table.
@@ -120,22 +396,32 @@ class QLearning:
         Returns:
             policy: Un dictionnaire contenant la politique optimale
         """
+        q = self.Q.values
+        best = q == q.max(axis=1, keepdims=True)
+        
         policy = {}
-        for state in self.Q:
-            # Trouver la valeur Q maximale pour cet état
-            max_q = max(self.Q[state].values())
-            
-            # Trouver toutes les actions qui ont cette valeur Q maximale
-            best_actions = [action for action, q_value in self.Q[state].items() if q_value == max_q]
+        for s, state in enumerate(self.Q):
+            # Trouver toutes les actions qui ont la valeur Q maximale
+            best_actions = np.flatnonzero(best[s])
             
             # Choisir une action au hasard parmi les meilleures actions
-            chosen_action = random.choice(best_actions)
+            chosen_action = self.env.actions[self.rng.choice(best_actions)]
             
             # Définir la politique (déterministe)
             policy[state] = {action: 0.0 for action in self.env.actions}
             policy[state][chosen_action] = 1.0
         return policy
     
+    def compile_policy(self):
+        """
+        Compile la politique gloutonne de la Q-table en Policy (un indice d'action int8
+        par état, première meilleure action en cas d'égalité), pour des requêtes par lots.
+        
+        Returns:
+            policy: La politique compilée
+        """
+        return Policy.from_q(self.Q.values, self.env.grid_size, self.env.actions)
+    
     def get_value_function(self):
         """
         Calcule la fonction de valeur d'état à partir de la Q-table.
@@ -143,10 +429,7 @@ class QLearning:
         Returns:
             V: Un dictionnaire contenant les valeurs d'état
         """
-        V = {}
-        for state in self.Q:
-            V[state] = max(self.Q[state].values())
-        return V
+        return dict(zip(self.Q, self.Q.values.max(axis=1).tolist()))
     
     def record_trajectory(self, max_steps=100):
         """
@@ -158,6 +441,7 @@ class QLearning:
         Returns:
             trajectory: Liste de tuples (état, action, récompense)
         """
+        policy = self.compile_policy()
         state = self.env.reset()
         trajectory = []
         done = False
@@ -165,7 +449,7 @@ class QLearning:
         
         while not done and steps < max_steps:
             # Choisir la meilleure action selon la politique actuelle
-            action = max(self.Q[state], key=self.Q[state].get)
+            action = policy.action(state)
             
             # Effectuer l'action
             next_state, reward, done = self.env.step(action)
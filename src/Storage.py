@@ -0,0 +1,190 @@
+import json
+import os
+import struct
+
+import numpy as np
+from src.Policy import Policy
+
+# Format d'un fichier de tables:
+#   MAGIC | longueur de l'en-tête (uint64, petit-boutiste) | en-tête JSON | tableaux bruts
+# Les données commencent au premier multiple de ALIGNMENT octets après l'en-tête, et
+# chaque tableau sur un multiple de ALIGNMENT octets: il est projeté tel quel
+# en mémoire par np.memmap, sans copie ni lecture du reste du fichier.
+MAGIC = b'FLTABLE1'
+ALIGNMENT = 64
+
+# Types de stockage par défaut: la politique est un indice d'action (-1: aucune action)
+DTYPES = {'V': np.float64, 'Q': np.float64, 'policy': np.int8}
+
+def save_tables(path, frozen_lake, gamma, V=None, Q=None, policy=None):
+    """
+    Enregistre des tables V, Q et politique sous forme de tableaux bruts, précédés d'un
+    en-tête décrivant la grille (taille, actions, gamma, empreinte de la carte).
+    L'écriture est atomique (fichier temporaire puis renommage).
+
+    Args:
+        path: Fichier de destination
+        frozen_lake: L'environnement dont proviennent les tables
+        gamma: Facteur de réduction utilisé pour les calculer
+        V: Valeurs d'état: tableau (S,) ou dictionnaire {(i, j): valeur}
+        Q: Valeurs d'action: tableau (S, A), QTable ou dictionnaire {(i, j): {action: valeur}}
+        policy: Politique: Policy, tableau (S,) d'indices d'actions, dictionnaire {(i, j): action}
+            (PolicyIteration) ou {(i, j): {action: probabilité}} (ValueIteration, QLearning)
+    """
+    n_states = frozen_lake.grid_size ** 2
+    actions = list(frozen_lake.actions)
+    tables = {}
+    if V is not None:
+        tables['V'] = _as_array(V, n_states, None, frozen_lake.grid_size)
+    if Q is not None:
+        if isinstance(getattr(Q, 'values', None), np.ndarray):
+            Q = Q.values  # QTable: tableau (S, A) sous-jacent
+        tables['Q'] = _as_array(Q, n_states, actions, frozen_lake.grid_size)
+    if policy is not None:
+        tables['policy'] = _policy_array(policy, n_states, actions, frozen_lake.grid_size)
+
+    # Position de chaque tableau, relative au début des données (premier alignement après l'en-tête)
+    header = {
+        'grid_size': frozen_lake.grid_size,
+        'actions': actions,
+        'gamma': float(gamma),
+        'map_hash': frozen_lake.map_hash(),
+        'tables': {},
+    }
+    layout = []
+    offset = 0
+    for name, array in tables.items():
+        layout.append((name, offset, array))
+        header['tables'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += _aligned(array.nbytes)
+    text = json.dumps(header).encode()
+    start = _aligned(len(MAGIC) + 8 + len(text))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(text)))
+        f.write(text)
+        for name, relative, array in layout:
+            f.seek(start + relative)
+            f.write(np.ascontiguousarray(array).data)
+        f.truncate(start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def load_tables(path, frozen_lake=None, mode='r'):
+    """
+    Ouvre un fichier de tables par projection en mémoire (np.memmap): rien n'est lu avant
+    l'accès, seules les pages consultées sont chargées, et plusieurs processus ouvrant
+    le même fichier partagent les mêmes pages du cache système.
+
+    Args:
+        path: Fichier écrit par save_tables
+        frozen_lake: Environnement attendu (optionnel): son empreinte doit correspondre
+        mode: Mode de np.memmap ('r' lecture seule, 'r+' modification, 'c' copie à l'écriture)
+
+    Returns:
+        tables: StoredTables donnant accès aux tables et à l'en-tête
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: fichier de tables invalide")
+        (length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(length))
+    start = _aligned(len(MAGIC) + 8 + length)
+
+    if frozen_lake is not None and header['map_hash'] != frozen_lake.map_hash():
+        raise ValueError(f"{path}: tables calculées pour une autre carte "
+                         f"(empreinte {header['map_hash']}, attendue {frozen_lake.map_hash()})")
+
+    arrays = {}
+    for name, info in header['tables'].items():
+        arrays[name] = np.memmap(path, dtype=np.dtype(info['dtype']), mode=mode,
+                                 offset=start + info['offset'], shape=tuple(info['shape']))
+    return StoredTables(header, arrays)
+
+class StoredTables:
+    """
+    Tables enregistrées par save_tables, projetées en mémoire. Les tableaux V (S,),
+    Q (S, A) et policy (S,) sont des np.memmap (None si absents du fichier);
+    les méthodes de consultation ne lisent que la ligne de l'état demandé.
+    """
+    def __init__(self, header, arrays):
+        self.header = header
+        self.grid_size = header['grid_size']
+        self.actions = header['actions']
+        self.gamma = header['gamma']
+        self.map_hash = header['map_hash']
+        self.V = arrays.get('V')
+        self.Q = arrays.get('Q')
+        self.policy = arrays.get('policy')
+
+    def index(self, state):
+        """
+        Convertit un état (i, j) en indice s = i * grid_size + j.
+        """
+        i, j = state
+        if not (0 <= i < self.grid_size and 0 <= j < self.grid_size):
+            raise KeyError(state)
+        return i * self.grid_size + j
+
+    def value(self, state):
+        """
+        Valeur de l'état (i, j).
+        """
+        return float(self.V[self.index(state)])
+
+    def q_values(self, state):
+        """
+        Valeurs d'action de l'état (i, j): {action: valeur}.
+        """
+        return dict(zip(self.actions, self.Q[self.index(state)].tolist()))
+
+    def action(self, state):
+        """
+        Action de la politique dans l'état (i, j) (None si aucune action, état terminal).
+        """
+        a = int(self.policy[self.index(state)])
+        return self.actions[a] if a >= 0 else None
+
+    def compiled_policy(self):
+        """
+        Politique enregistrée sous forme de Policy, adossée au fichier projeté (sans copie).
+        """
+        return Policy(self.policy, self.grid_size, self.actions)
+
+def _aligned(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+def _as_array(table, n_states, actions, grid_size):
+    """
+    Convertit V (actions=None) ou Q en tableau contigu, depuis un tableau ou un dictionnaire.
+    """
+    dtype = DTYPES['V' if actions is None else 'Q']
+    if isinstance(table, dict):
+        array = np.zeros(n_states if actions is None else (n_states, len(actions)), dtype=dtype)
+        for (i, j), value in table.items():
+            array[i * grid_size + j] = value if actions is None else [value[action] for action in actions]
+        return array
+    array = np.asarray(table)
+    if not np.issubdtype(array.dtype, np.floating):
+        array = array.astype(dtype)  # float32 conservé tel quel (QLearning)
+    expected = (n_states,) if actions is None else (n_states, len(actions))
+    if array.shape != expected:
+        raise ValueError(f"Table de forme {array.shape}, attendue {expected}")
+    return array
+
+def _policy_array(policy, n_states, actions, grid_size):
+    """
+    Convertit une politique (Policy, dictionnaire ou tableau) en tableau (S,) d'indices
+    d'actions (-1: aucune action).
+    """
+    if isinstance(policy, Policy):
+        return policy.table
+    if isinstance(policy, dict):
+        return Policy.from_dict(policy, grid_size, actions).table
+    array = np.asarray(policy)
+    if array.shape != (n_states,):
+        raise ValueError(f"Politique de forme {array.shape}, attendue {(n_states,)}")
+    return array.astype(DTYPES['policy'])
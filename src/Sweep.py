@@ -0,0 +1,81 @@
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.Qlearning import QLearning
+
+# Hyperparamètres de QLearning pouvant être balayés
+PARAMETERS = ('alpha', 'gamma', 'epsilon')
+
+def run_sweep(param_grid, seeds=(0,), episodes=5000, grid_size=7, max_workers=None):
+    """
+    Entraîne des agents QLearning indépendants pour chaque combinaison d'hyperparamètres
+    et chaque graine, répartis sur un ProcessPoolExecutor. Chaque tâche construit son
+    propre environnement et son propre générateur aléatoire.
+
+    Args:
+        param_grid: Dictionnaire {paramètre: liste de valeurs} parmi alpha, gamma, epsilon
+            (ex: {'alpha': [0.1, 0.2], 'gamma': [0.9, 0.99]})
+        seeds: Graines aléatoires; chaque combinaison est entraînée une fois par graine
+        episodes: Nombre d'épisodes d'entraînement par agent
+        grid_size: Taille de la grille FrozenLake
+        max_workers: Nombre de processus (par défaut: nombre de cœurs)
+
+    Returns:
+        results: Tableau structuré NumPy, une ligne par entraînement, avec les champs
+            alpha, gamma, epsilon, seed, time (secondes), rewards (episodes,),
+            steps (episodes,) et Q (S, A)
+    """
+    unknown = set(param_grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus: {sorted(unknown)} (attendus: {PARAMETERS})")
+
+    names = list(param_grid)
+    jobs = [(dict(zip(names, values)), seed, episodes, grid_size)
+            for values in itertools.product(*(param_grid[name] for name in names))
+            for seed in seeds]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        runs = list(executor.map(_train_one, jobs))
+
+    n_states = grid_size ** 2
+    n_actions = len(FrozenLake(grid_size).actions)
+    dtype = [(name, np.float64) for name in PARAMETERS] + [
+        ('seed', np.int64),
+        ('time', np.float64),
+        ('rewards', np.float64, (episodes,)),
+        ('steps', np.int64, (episodes,)),
+        ('Q', np.float64, (n_states, n_actions)),
+    ]
+    results = np.zeros(len(runs), dtype=dtype)
+    for k, run in enumerate(runs):
+        for field, value in run.items():
+            results[field][k] = value
+    return results
+
+def _train_one(job):
+    """
+    Entraîne un agent dans un processus de travail.
+    """
+    params, seed, episodes, grid_size = job
+
+    env = FrozenLake(grid_size=grid_size)
+    agent = QLearning(env, seed=seed, callback=Callback(), **params)
+
+    start = time.perf_counter()
+    rewards, steps = agent.train(episodes=episodes)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'alpha': agent.alpha,
+        'gamma': agent.gamma,
+        'epsilon': agent.epsilon,
+        'seed': seed,
+        'time': elapsed,
+        'rewards': rewards,
+        'steps': steps,
+        'Q': agent.Q.values,
+    }
@@ -0,0 +1,241 @@
+import numpy as np
+
+class TrainingStats:
+    """
+    Statistiques d'apprentissage calculées en flux, à mémoire constante quelle que soit
+    la durée de l'entraînement:
+    - moyenne et variance de toutes les récompenses et durées d'épisode (algorithme de Welford);
+    - moyennes mobiles sur les `window` derniers épisodes, mises à jour en O(1) via un tampon circulaire;
+    - historique sous-échantillonné d'au plus `history_size` points: chaque point est la moyenne
+      d'un bloc d'épisodes consécutifs, et la taille des blocs double quand l'historique est plein.
+    """
+    def __init__(self, window=100, history_size=1000):
+        """
+        Args:
+            window: Nombre d'épisodes de la fenêtre des moyennes mobiles
+            history_size: Nombre maximum de points de l'historique (0 pour ne pas le conserver)
+        """
+        if window < 1:
+            raise ValueError(f"window doit être strictement positif: {window}")
+        if history_size % 2:
+            raise ValueError(f"history_size doit être pair: {history_size}")
+        self.window = window
+        self.history_size = history_size
+        self.count = 0
+
+        # Welford: moyennes et sommes des carrés des écarts
+        self._mean_reward = 0.0
+        self._m2_reward = 0.0
+        self._mean_steps = 0.0
+        self._m2_steps = 0.0
+
+        # Tampons circulaires de la fenêtre et sommes courantes
+        self._rewards = [0.0] * window
+        self._steps = [0] * window
+        self._pos = 0
+        self._window_reward = 0.0
+        self._window_steps = 0
+
+        # Historique sous-échantillonné: blocs de `stride` épisodes
+        self.stride = 1
+        self._history_rewards = np.zeros(history_size)
+        self._history_steps = np.zeros(history_size)
+        self._history_len = 0
+        self._block_reward = 0.0
+        self._block_steps = 0
+        self._block_count = 0
+
+    def add(self, reward, steps):
+        """
+        Enregistre un épisode terminé, en O(1) (amorti pour l'historique).
+
+        Args:
+            reward: Récompense cumulée de l'épisode
+            steps: Nombre d'étapes de l'épisode
+        """
+        self.count += 1
+        n = self.count
+
+        delta = reward - self._mean_reward
+        self._mean_reward += delta / n
+        self._m2_reward += delta * (reward - self._mean_reward)
+        delta = steps - self._mean_steps
+        self._mean_steps += delta / n
+        self._m2_steps += delta * (steps - self._mean_steps)
+
+        # Fenêtre glissante: la valeur la plus ancienne est remplacée
+        pos = self._pos
+        self._window_reward += reward - self._rewards[pos]
+        self._window_steps += steps - self._steps[pos]
+        self._rewards[pos] = reward
+        self._steps[pos] = steps
+        pos += 1
+        if pos == self.window:
+            pos = 0
+            # Somme recalculée à chaque tour du tampon: pas de dérive d'arrondi
+            self._window_reward = sum(self._rewards)
+        self._pos = pos
+
+        if self.history_size:
+            self._block_reward += reward
+            self._block_steps += steps
+            self._block_count += 1
+            if self._block_count == self.stride:
+                self._push_history()
+
+    def extend(self, rewards, steps):
+        """
+        Enregistre plusieurs épisodes terminés, dans l'ordre.
+        """
+        for reward, n_steps in zip(rewards, steps):
+            self.add(reward, n_steps)
+
+    def _push_history(self):
+        """
+        Ajoute le bloc courant à l'historique; si celui-ci est plein, les points sont
+        fusionnés deux à deux et la taille des blocs double.
+        """
+        if self._history_len == self.history_size:
+            half = self.history_size // 2
+            self._history_rewards[:half] = self._history_rewards.reshape(half, 2).mean(axis=1)
+            self._history_steps[:half] = self._history_steps.reshape(half, 2).mean(axis=1)
+            self._history_len = half
+            self.stride *= 2
+            # Le bloc courant ne couvre que l'ancienne taille: il sera complété
+            if self._block_count < self.stride:
+                return
+
+        self._history_rewards[self._history_len] = self._block_reward / self._block_count
+        self._history_steps[self._history_len] = self._block_steps / self._block_count
+        self._history_len += 1
+        self._block_reward = 0.0
+        self._block_steps = 0
+        self._block_count = 0
+
+    @property
+    def mean_reward(self):
+        return self._mean_reward
+
+    @property
+    def mean_steps(self):
+        return self._mean_steps
+
+    @property
+    def var_reward(self):
+        return self._m2_reward / self.count if self.count else 0.0
+
+    @property
+    def var_steps(self):
+        return self._m2_steps / self.count if self.count else 0.0
+
+    @property
+    def std_reward(self):
+        return self.var_reward ** 0.5
+
+    @property
+    def std_steps(self):
+        return self.var_steps ** 0.5
+
+    @property
+    def moving_reward(self):
+        """
+        Récompense moyenne des `window` derniers épisodes (ou de tous s'il y en a moins).
+        """
+        return self._window_reward / min(self.count, self.window) if self.count else 0.0
+
+    @property
+    def moving_steps(self):
+        """
+        Durée moyenne des `window` derniers épisodes (ou de tous s'il y en a moins).
+        """
+        return self._window_steps / min(self.count, self.window) if self.count else 0.0
+
+    def recent(self):
+        """
+        Retourne les récompenses et durées des derniers épisodes, du plus ancien au plus récent.
+
+        Returns:
+            rewards: Tableau des min(count, window) dernières récompenses
+            steps: Tableau des durées correspondantes
+        """
+        n = min(self.count, self.window)
+        order = np.arange(self._pos - n, self._pos) % self.window
+        return np.asarray(self._rewards)[order], np.asarray(self._steps)[order]
+
+    def history(self):
+        """
+        Retourne l'historique sous-échantillonné (blocs complets uniquement).
+
+        Returns:
+            episodes: Numéro du dernier épisode de chaque bloc
+            rewards: Récompense moyenne de chaque bloc
+            steps: Durée moyenne de chaque bloc
+        """
+        n = self._history_len
+        episodes = np.arange(1, n + 1) * self.stride
+        return episodes, self._history_rewards[:n].copy(), self._history_steps[:n].copy()
+
+    def get_state(self):
+        """
+        Exporte l'état interne complet sous forme de tableaux NumPy (voir Checkpoint),
+        de façon à reprendre les statistiques exactement là où elles se sont arrêtées.
+
+        Returns:
+            state: Dictionnaire {nom: tableau}
+        """
+        return {
+            'window': np.int64(self.window),
+            'history_size': np.int64(self.history_size),
+            'count': np.int64(self.count),
+            'welford': np.array([self._mean_reward, self._m2_reward, self._mean_steps, self._m2_steps]),
+            'rewards': np.array(self._rewards, dtype=np.float64),
+            'steps': np.array(self._steps, dtype=np.int64),
+            'pos': np.int64(self._pos),
+            'window_sums': np.array([self._window_reward, self._window_steps], dtype=np.float64),
+            'stride': np.int64(self.stride),
+            'history_rewards': self._history_rewards.copy(),
+            'history_steps': self._history_steps.copy(),
+            'history_len': np.int64(self._history_len),
+            'block': np.array([self._block_reward, self._block_steps, self._block_count], dtype=np.float64),
+        }
+
+    def set_state(self, state):
+        """
+        Restaure un état exporté par get_state.
+
+        Args:
+            state: Dictionnaire {nom: tableau} (par exemple lu dans un fichier .npz)
+        """
+        if int(state['window']) != self.window or int(state['history_size']) != self.history_size:
+            raise ValueError(f"État incompatible: window={int(state['window'])}, "
+                             f"history_size={int(state['history_size'])} "
+                             f"(attendu: {self.window}, {self.history_size})")
+        self.count = int(state['count'])
+        self._mean_reward, self._m2_reward, self._mean_steps, self._m2_steps = state['welford'].tolist()
+        self._rewards = state['rewards'].tolist()
+        self._steps = state['steps'].tolist()
+        self._pos = int(state['pos'])
+        self._window_reward = float(state['window_sums'][0])
+        self._window_steps = int(state['window_sums'][1])
+        self.stride = int(state['stride'])
+        self._history_rewards = np.array(state['history_rewards'], dtype=np.float64)
+        self._history_steps = np.array(state['history_steps'], dtype=np.float64)
+        self._history_len = int(state['history_len'])
+        block_reward, block_steps, block_count = state['block'].tolist()
+        self._block_reward = block_reward
+        self._block_steps = int(block_steps)
+        self._block_count = int(block_count)
+
+    def summary(self):
+        """
+        Résumé sérialisable des statistiques courantes.
+        """
+        return {
+            'episodes': self.count,
+            'mean_reward': float(self.mean_reward),
+            'std_reward': float(self.std_reward),
+            'mean_steps': float(self.mean_steps),
+            'std_steps': float(self.std_steps),
+            'moving_reward': float(self.moving_reward),
+            'moving_steps': float(self.moving_steps),
+        }
@@ -1,67 +1,167 @@
+import heapq
 import numpy as np
-from src.Affichage import Affichage
-import random
+from src.Callbacks import hook, make_callback
+from src.Instrumentation import Instrumentation
+from src.Policy import Policy
+
+def compile_backup(next_state, reward, terminal, gamma):
+    """
+    Prépare les tableaux du backup de Bellman Q = reward + discount * V[..., next_state],
+    pour une carte ou un lot de cartes partageant la même géométrie (BatchPlanner).
+    Les états terminaux gardent une valeur nulle: leurs lignes sont annulées une fois pour toutes.
+    
+    Args:
+        next_state: Tableau (S, A) des états suivants
+        reward: Tableau (..., S, A) des récompenses
+        terminal: Tableau (..., S) des états terminaux
+        gamma: Facteur de réduction
+    
+    Returns:
+        reward: Tableau (..., S, A) des récompenses (nulles depuis un état terminal)
+        discount: Tableau (..., S, A) valant gamma pour les transitions vers un état non terminal, 0 sinon
+    """
+    active = ~terminal[..., None]
+    reward = np.where(active, reward, 0.0)
+    discount = gamma * (active & ~terminal[..., next_state])
+    return reward, discount
+
+def bellman_backup(V, next_state, reward, discount, Q, V_new):
+    """
+    Backup de Bellman vectorisé, sans allocation: Q = reward + discount * V[..., next_state]
+    puis V_new = Q.max(-1). V est de forme (S,) ou (B, S) (lot de cartes).
+    
+    Returns:
+        V_new: Les nouvelles valeurs d'état
+    """
+    np.take(V, next_state, axis=-1, out=Q, mode='clip')  # indices valides: 'clip' évite une copie
+    Q *= discount
+    Q += reward
+    return greedy_values(Q, V_new)
+
+def greedy_values(Q, out):
+    """
+    Calcule out = Q.max(-1) action par action: bien plus rapide que Q.max(axis=-1)
+    sur un axe de taille A.
+    """
+    np.maximum(Q[..., 0], Q[..., 1], out=out)
+    for a in range(2, Q.shape[-1]):
+        np.maximum(out, Q[..., a], out=out)
+    return out
 
 class ValueIteration:
-    def __init__(self, frozen_lake, gamma=0.9):
+    BACKENDS = ('python', 'numpy', 'prioritized')
+    
+    def __init__(self, frozen_lake, gamma=0.9, backend='python', seed=None, callback=None, instrument=False):
         """
         Initialisation de l'algorithme Value Iteration.
         
         Args:
             frozen_lake: L'environnement FrozenLake
             gamma: Facteur de réduction pour les récompenses futures
+            backend: 'python' (balayage état par état sur des dictionnaires),
+                'numpy' (backup de Bellman vectorisé sur des tableaux; seul backend
+                gérant les glissements, par produits matrice creuse-vecteur) ou
+                'prioritized' (Value Iteration asynchrone par balayage prioritaire:
+                seuls les états de fort résidu de Bellman sont mis à jour)
+            seed: Graine ou np.random.Generator utilisé pour départager les égalités
+            callback: Callback notifié à chaque itération et à la convergence
+                (None: ProgressLogger; Callback() pour n'afficher rien)
+            instrument: Chronométrer les phases de run dans self.stats
+                (model, sweeps, policy); les compteurs sont toujours renseignés
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend inconnu: {backend!r} (attendu: {self.BACKENDS})")
+        if frozen_lake.is_slippery and backend != 'numpy':
+            raise ValueError(f"Le backend {backend!r} suppose une dynamique déterministe: "
+                             "utiliser backend='numpy' avec success_prob < 1")
         self.frozen_lake = frozen_lake
         self.gamma = gamma
+        self.backend = backend
+        self.rng = np.random.default_rng(seed)
+        self.callback = make_callback(callback)
         self.actions = frozen_lake.actions
         self.n_actions = len(self.actions)
         self.grid_size = frozen_lake.grid_size
         self.n_states = frozen_lake.grid_size ** 2
-        self.affichage = Affichage(frozen_lake)
+        self._affichage = None  # créé au premier affichage (voir la propriété affichage)
         
-        # Initialisation des valeurs d'état
+        # Initialisation des valeurs d'état, de la Q-table et de la politique
+        # (le backend numpy ne les remplit qu'à la demande, via to_dict)
         self.V = {}
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                self.V[(i, j)] = 0.0
-        
-        # Initialisation de la Q-table
         self.Q = {}
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                self.Q[(i, j)] = {action: 0.0 for action in self.actions}
-                
-        # Initialisation de la politique (sera calculée après value iteration)
         self.policy = {}
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                self.policy[(i, j)] = {action: 0.0 for action in self.actions}
+        if backend == 'python':
+            for i in range(self.grid_size):
+                for j in range(self.grid_size):
+                    self.V[(i, j)] = 0.0
+                    self.Q[(i, j)] = {action: 0.0 for action in self.actions}
+                    self.policy[(i, j)] = {action: 0.0 for action in self.actions}
+        
+        # Représentation tableau utilisée par le backend numpy
+        self.V_array = None  # (S,)
+        self.Q_array = None  # (S, A)
+        self.policy_array = None  # (S,) indices d'actions
+        self._backup = None  # tableaux du backup de Bellman (voir _compiled_backup)
+        
+        # Nombre d'itérations (balayages complets) et de mises à jour d'état du dernier appel à run
+        self.iterations = 0
+        self.backups = 0
+        self.stats = Instrumentation(enabled=instrument)
     
-    def run(self, seuil=0.001, max_iterations=1000):
+    def run(self, seuil=0.001, max_iterations=1000, as_dict=None):
         """
         Exécute l'algorithme Value Iteration.
         
         Args:
             seuil: Seuil de convergence pour arrêter l'algorithme
             max_iterations: Nombre maximum d'itérations
+            as_dict: Retourner des dictionnaires indexés par (i, j). Par défaut
+                True pour le backend 'python' et False pour les backends tableau
         
         Returns:
             V: Valeurs d'état optimales
             policy: Politique optimale
+            Q: Valeurs d'action
+        """
+        self.stats.reset()
+        if self.backend == 'python':
+            self._run_python(seuil, max_iterations)
+        elif self.backend == 'numpy':
+            self._run_numpy(seuil, max_iterations)
+        else:
+            self._run_prioritized(seuil, max_iterations)
+        self.stats.count('sweeps', self.iterations)
+        self.stats.count('backups', self.backups)
+        
+        if self.backend == 'python':
+            return self.V, self.policy, self.Q
+        if as_dict:
+            return self.to_dict()
+        return self.V_array, self.policy_array, self.Q_array
+    
+    def _run_python(self, seuil, max_iterations):
+        """
+        Value Iteration état par état sur les dictionnaires self.V, self.Q et self.policy.
         """
         iterations = 0
+        on_iteration = hook(self.callback, 'on_iteration')
         
-        while True:
-            iterations += 1
-            delta = 0  # Pour mesurer la convergence
-            
-            # Pour chaque état
-            for i in range(self.grid_size):
-                for j in range(self.grid_size):
-                    state = (i, j)
-                    
+        # Modèle de transition compilé (états indexés par s = i * grid_size + j)
+        with self.stats.phase('model'):
+            next_state, reward, terminal = self.frozen_lake.get_transition_model()
+            next_state = next_state.tolist()
+            reward = reward.tolist()
+            states = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size)]
+        
+        with self.stats.phase('sweeps'):
+            while True:
+                iterations += 1
+                delta = 0  # Pour mesurer la convergence
+                
+                # Pour chaque état
+                for s, state in enumerate(states):
                     # Ignorer les états terminaux (but ou pièges)
-                    if state == self.frozen_lake.goal or state in self.frozen_lake.traps:
+                    if terminal[s]:
                         continue
                     
                     # Sauvegarder l'ancienne valeur
@@ -71,19 +171,9 @@ class ValueIteration:
                     best_action_value = float('-inf')
                     
                     # Pour chaque action possible
-                    for action in self.actions:
-                        # Sauvegarder l'état actuel
-                        old_state = self.frozen_lake.state
-                        self.frozen_lake.state = state
-                        
-                        # Simuler l'action et obtenir le nouvel état et la récompense
-                        next_state, reward, done = self.frozen_lake.step(action)
-                        
-                        # Restaurer l'état
-                        self.frozen_lake.state = old_state
-                        
-                        # Calculer la valeur de cette action
-                        action_value = reward + self.gamma * self.V[next_state]
+                    for a, action in enumerate(self.actions):
+                        # Calculer la valeur de cette action à partir du modèle
+                        action_value = reward[s][a] + self.gamma * self.V[states[next_state[s][a]]]
                         self.Q[state][action] = action_value
                         
                         # Mettre à jour la meilleure valeur d'action si nécessaire
@@ -94,18 +184,268 @@ class ValueIteration:
                     
                     # Calculer le delta (différence entre l'ancienne et la nouvelle valeur)
                     delta = max(delta, abs(v - self.V[state]))
+                
+                # Notifier la progression
+                if on_iteration is not None:
+                    on_iteration(self, iterations, delta)
+                
+                # Vérifier la convergence ou le nombre maximum d'itérations
+                if delta < seuil or iterations >= max_iterations:
+                    self.callback.on_converged(self, iterations, delta)
+                    break
+        
+        self.iterations = iterations
+        self.backups = iterations * self.n_states
+        
+        # Calculer la politique optimale à partir des valeurs d'état finales
+        with self.stats.phase('policy'):
+            self._calculate_optimal_policy()
+    
+    def _run_numpy(self, seuil, max_iterations):
+        """
+        Value Iteration vectorisée: chaque itération est un unique backup
+        Q = R + gamma * V[next] * ~terminal suivi de V = Q.max(1).
+        Avec glissements, le backup est une espérance calculée par un produit
+        matrice creuse-vecteur: Q = R + gamma * (P @ V).
+        En cas d'égalité, la politique retient la première action.
+        """
+        if self.frozen_lake.is_slippery:
+            D, reward = self._compiled_expectation()
+            shape = reward.shape
             
-            # Afficher la progression toutes les 10 itérations
-            if iterations % 1 == 0:
-                print(f"Itération {iterations}, Delta = {delta:.6f}")
+            def backup(V, Q, V_new):
+                np.add(reward, (D @ V).reshape(shape), out=Q)
+                return greedy_values(Q, V_new)
+        else:
+            next_state, reward, discount = self._compiled_backup()
             
-            # Vérifier la convergence ou le nombre maximum d'itérations
-            if delta < seuil or iterations >= max_iterations:
-                print(f"Algorithme convergé après {iterations} itérations avec delta = {delta:.6f}")
-                break
+            def backup(V, Q, V_new):
+                return bellman_backup(V, next_state, reward, discount, Q, V_new)
         
-        # Calculer la politique optimale à partir des valeurs d'état finales
-        self._calculate_optimal_policy()
+        V = np.zeros(self.n_states)
+        V_new = np.empty_like(V)
+        Q = np.empty(reward.shape)
+        iterations = 0
+        on_iteration = hook(self.callback, 'on_iteration')
+        
+        with self.stats.phase('sweeps'):
+            while True:
+                iterations += 1
+                
+                backup(V, Q, V_new)
+                delta = np.abs(V_new - V).max()
+                V, V_new = V_new, V
+                
+                if on_iteration is not None:
+                    on_iteration(self, iterations, delta)
+                
+                if delta < seuil or iterations >= max_iterations:
+                    self.callback.on_converged(self, iterations, delta)
+                    break
+        
+        self.iterations = iterations
+        self.backups = iterations * self.n_states
+        
+        self.V_array = V
+        self.Q_array = Q
+        with self.stats.phase('policy'):
+            self.policy_array = Q.argmax(axis=1)
+    
+    def _compiled_backup(self):
+        """
+        Prépare les tableaux du backup de Bellman Q = reward + discount * V[next_state]
+        (voir compile_backup). Les tableaux sont conservés pour les re-résolutions incrémentales (voir resolve).
+        
+        Returns:
+            next_state: Tableau (S, A) des états suivants
+            reward: Tableau (S, A) des récompenses (nulles depuis un état terminal)
+            discount: Tableau (S, A) valant gamma pour les transitions vers un état non terminal, 0 sinon
+        """
+        with self.stats.phase('model'):
+            next_state, reward, terminal = self.frozen_lake.get_transition_model()
+            reward, discount = compile_backup(next_state, reward, terminal, self.gamma)
+            self._backup = (next_state, reward, discount)
+        return self._backup
+    
+    def _compiled_expectation(self):
+        """
+        Prépare le backup espéré de la dynamique avec glissements: Q = reward + (D @ V).reshape(S, A)
+        avec D = gamma * P (voir FrozenLake.get_sparse_model). Les lignes des états terminaux
+        de P sont vides: leur valeur reste nulle.
+        
+        Returns:
+            D: Matrice creuse CSR (S * A, S) des probabilités de transition actualisées
+            reward: Tableau (S, A) des récompenses espérées
+        """
+        with self.stats.phase('model'):
+            P, reward, terminal = self.frozen_lake.get_sparse_model()
+            D = (self.gamma * P).tocsr()
+        return D, reward
+    
+    def _run_prioritized(self, seuil, max_iterations):
+        """
+        Value Iteration asynchrone par balayage prioritaire depuis V = 0
+        (voir _prioritized_sweep).
+        """
+        next_state, reward, discount = self._compiled_backup()
+        
+        # Résidus initiaux: un unique backup vectorisé depuis V = 0
+        V = np.zeros(self.n_states)
+        residual = np.abs(reward.max(axis=1))
+        priority = np.where(residual > seuil, residual, 0.0)
+        
+        with self.stats.phase('sweeps'):
+            backups, _ = self._prioritized_sweep(V, priority, seuil, max_iterations * self.n_states)
+        
+        self.iterations = 0
+        self.backups = backups
+        self.callback.on_converged(self, 0, None)
+        
+        with self.stats.phase('policy'):
+            Q = reward + discount * V[next_state]
+            self.policy_array = Q.argmax(axis=1)
+        self.V_array = V
+        self.Q_array = Q
+    
+    def _prioritized_sweep(self, V, priority, seuil, max_backups):
+        """
+        Balayage prioritaire: une file de priorité contient les états dont le résidu de
+        Bellman dépasse seuil; l'état de plus fort résidu est mis à jour (V est modifié
+        sur place), puis la priorité de ses prédécesseurs (index inverse du modèle) est
+        augmentée de gamma * |variation|, qui borne l'évolution de leur résidu.
+        S'arrête quand la file est vide ou après max_backups mises à jour.
+        
+        Args:
+            V: Valeurs d'état de départ, modifiées sur place
+            priority: Priorités initiales (résidus), modifiées sur place
+            seuil: Seuil de convergence
+            max_backups: Nombre maximum de mises à jour
+        
+        Returns:
+            backups: Nombre de mises à jour effectuées
+            updated: Liste des états dont la valeur a changé
+        """
+        next_state, reward, discount = self._backup
+        indptr, predecessors = self.frozen_lake.get_predecessors()
+        
+        # Seuls les états mis à jour sont lus: les lignes sont converties à la demande,
+        # sans conversion globale des tableaux (coûteuse sur les grandes grilles)
+        seeds = np.flatnonzero(priority > seuil)
+        heap = [(-p, s) for s, p in zip(seeds.tolist(), priority[seeds].tolist())]
+        heapq.heapify(heap)
+        actions = range(self.n_actions)
+        
+        backups = 0
+        updated = []
+        
+        while heap and backups < max_backups:
+            neg_priority, s = heapq.heappop(heap)
+            if -neg_priority != priority[s]:
+                continue  # entrée périmée
+            priority[s] = 0.0
+            
+            ns, r, d = next_state[s].tolist(), reward[s].tolist(), discount[s].tolist()
+            values = V[ns].tolist()
+            new_value = max([r[a] + d[a] * values[a] for a in actions])
+            backups += 1
+            change = abs(new_value - V[s])
+            if change <= seuil:
+                continue
+            V[s] = new_value
+            updated.append(s)
+            
+            # Le résidu d'un prédécesseur augmente d'au plus gamma * |variation|:
+            # ces bornes sont cumulées jusqu'à sa prochaine mise à jour
+            bound = self.gamma * change
+            for p in predecessors[indptr[s]:indptr[s + 1]].tolist():
+                priority[p] += bound
+                if priority[p] > seuil:
+                    heapq.heappush(heap, (-float(priority[p]), p))
+        
+        return backups, updated
+    
+    def resolve(self, changed, seuil=0.001, max_iterations=1000, as_dict=None):
+        """
+        Re-résout après une modification de la carte (FrozenLake.update_map), en partant
+        des valeurs et de la Q-table précédentes. Seules les lignes du backup touchées par
+        les cases modifiées sont recalculées, puis les valeurs sont propagées depuis la zone
+        modifiée par balayage prioritaire: le coût est proportionnel à la zone affectée.
+        
+        Args:
+            changed: Indices des cases modifiées, retournés par FrozenLake.update_map
+            seuil: Seuil de convergence
+            max_iterations: Limite de mises à jour, en balayages équivalents
+            as_dict: Retourner des dictionnaires indexés par (i, j)
+        
+        Returns:
+            V: Valeurs d'état optimales
+            policy: Politique optimale
+            Q: Valeurs d'action
+        """
+        if self.V_array is None or self._backup is None:
+            raise ValueError("resolve nécessite un premier appel à run avec un backend tableau "
+                             "sur une dynamique déterministe")
+        
+        self.stats.reset()
+        changed = np.asarray(changed, dtype=np.int64)
+        next_state, reward, discount = self._backup
+        terminal = self.frozen_lake.get_transition_model()[2]
+        model_reward = self.frozen_lake.get_transition_model()[1]
+        V = self.V_array
+        
+        # Lignes du backup touchées: les cases modifiées et leurs prédécesseurs
+        with self.stats.phase('model'):
+            rows = np.unique(np.concatenate([changed, self.frozen_lake.predecessors_of(changed)]))
+            active = ~terminal[rows, None]
+            reward[rows] = np.where(active, model_reward[rows], 0.0)
+            discount[rows] = self.gamma * (active & ~terminal[next_state[rows]])
+        
+        # Résidus exacts des lignes touchées, puis propagation depuis la zone modifiée
+        with self.stats.phase('sweeps'):
+            residual = np.abs((reward[rows] + discount[rows] * V[next_state[rows]]).max(axis=1) - V[rows])
+            priority = np.zeros(self.n_states)
+            priority[rows] = np.where(residual > seuil, residual, 0.0)
+            backups, updated = self._prioritized_sweep(V, priority, seuil, max_iterations * self.n_states)
+        
+        self.iterations = 0
+        self.backups = backups
+        self.stats.count('backups', backups)
+        self.stats.count('patched_rows', len(rows))
+        self.callback.on_converged(self, 0, None)
+        
+        # Q et politique recalculées pour les seules lignes dont un successeur a changé
+        with self.stats.phase('policy'):
+            updated = np.array(updated, dtype=np.int64)
+            stale = np.unique(np.concatenate([rows, updated, self.frozen_lake.predecessors_of(updated)]))
+            self.Q_array[stale] = reward[stale] + discount[stale] * V[next_state[stale]]
+            self.policy_array[stale] = self.Q_array[stale].argmax(axis=1)
+        
+        if as_dict:
+            return self.to_dict()
+        return self.V_array, self.policy_array, self.Q_array
+    
+    def to_dict(self):
+        """
+        Convertit les résultats des backends tableau en dictionnaires indexés par (i, j),
+        au même format que le backend 'python'.
+        
+        Returns:
+            V: Valeurs d'état
+            policy: Politique (probabilités 1.0 / 0.0 par action)
+            Q: Valeurs d'action
+        """
+        terminal = self.frozen_lake.get_transition_model()[2]
+        V = self.V_array.tolist()
+        Q = self.Q_array.tolist()
+        policy = self.policy_array.tolist()
+        
+        for s in range(self.n_states):
+            state = divmod(s, self.grid_size)
+            self.V[state] = V[s]
+            self.Q[state] = dict(zip(self.actions, Q[s]))
+            self.policy[state] = {action: 0.0 for action in self.actions}
+            if not terminal[s]:
+                self.policy[state][self.actions[policy[s]]] = 1.0
         
         return self.V, self.policy, self.Q
     
@@ -114,12 +454,13 @@ class ValueIteration:
         Calcule la politique optimale basée sur les valeurs Q finales.
         En cas d'égalité, choisit une action au hasard parmi les meilleures.
         """
+        terminal = self.frozen_lake.get_transition_model()[2]
         for i in range(self.grid_size):
             for j in range(self.grid_size):
                 state = (i, j)
                 
                 # Ignorer les états terminaux
-                if state == self.frozen_lake.goal or state in self.frozen_lake.traps:
+                if terminal[i * self.grid_size + j]:
                     continue
                 
                 # Trouver la valeur Q maximale
@@ -129,15 +470,42 @@ class ValueIteration:
                 best_actions = [action for action, q_value in self.Q[state].items() if q_value == max_q]
                 
                 # Choisir une action au hasard parmi les meilleures actions
-                best_action = random.choice(best_actions)
+                best_action = best_actions[self.rng.integers(len(best_actions))]
                 
                 # Définir la politique (déterministe)
                 for action in self.actions:
                     self.policy[state][action] = 1.0 if action == best_action else 0.0
+    
+    def compile_policy(self):
+        """
+        Compile la politique du dernier appel à run en Policy (un indice d'action int8
+        par état, -1 pour les états terminaux), pour des requêtes par lots.
+        
+        Returns:
+            policy: La politique compilée
+        """
+        if self.policy_array is not None:
+            terminal = self.frozen_lake.get_transition_model()[2]
+            return Policy(np.where(terminal, -1, self.policy_array), self.grid_size, self.actions)
+        return Policy.from_dict(self.policy, self.grid_size, self.actions)
+    
+    @property
+    def affichage(self):
+        """
+        Affichage de l'environnement, créé à la première utilisation: matplotlib n'est
+        importé que si un résultat est effectivement affiché.
+        """
+        if self._affichage is None:
+            from src.Affichage import Affichage
+            self._affichage = Affichage(self.frozen_lake)
+        return self._affichage
+    
     def afficher_resultats(self):
         """
         Affiche les résultats de l'algorithme Value Iteration.
         """
+        if self.backend != 'python' and self.V_array is not None:
+            self.to_dict()
         self.affichage.afficher_q_table(self.Q)
         self.affichage.afficher_policy(self.policy)
         self.affichage.afficher_valeurs_etat(self.V)
\ No newline at end of file
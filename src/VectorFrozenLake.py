@@ -0,0 +1,87 @@
+import numpy as np
+
+class VectorFrozenLake:
+    """
+    N instances de FrozenLake simulées en parallèle (même carte, agents indépendants).
+    Les positions sont des indices entiers s = i * grid_size + j et les actions des
+    indices dans env.actions. Les agents qui terminent un épisode sont remis au départ
+    automatiquement.
+    """
+    def __init__(self, env, n_envs=64):
+        """
+        Args:
+            env: L'environnement FrozenLake servant de modèle (grille, départ, actions)
+            n_envs: Nombre d'agents simulés simultanément
+        """
+        self.env = env
+        self.n_envs = n_envs
+        self.grid_size = env.grid_size
+        self.actions = env.actions
+
+        # Dynamique compilée de l'environnement modèle (voir FrozenLake.get_transition_model)
+        self.next_state, self.reward, self.terminal = env.get_transition_model()
+        self.start = env.state_to_index(env.start)
+
+        # Glissements: mêmes probabilités et même générateur que l'environnement modèle
+        self.success_prob = env.success_prob
+        self.rng = env.rng
+        index = {action: a for a, action in enumerate(self.actions)}
+        self.perpendicular = np.array([[index[side] for side in env.perpendicular[action]]
+                                       for action in self.actions])
+
+        self._states = np.empty(n_envs, dtype=np.int64)
+        self.reset()
+
+    @property
+    def states(self):
+        """
+        Indices des positions courantes des agents.
+        """
+        return self._states.copy()
+
+    def reset(self, mask=None):
+        """
+        Replace les agents sur la case de départ.
+
+        Args:
+            mask: Tableau booléen (N,) des agents à replacer (tous par défaut)
+
+        Returns:
+            states: Tableau (N,) des états courants
+        """
+        if mask is None:
+            self._states.fill(self.start)
+        else:
+            self._states[mask] = self.start
+        return self.states
+
+    def step(self, actions):
+        """
+        Applique une action par agent.
+
+        Args:
+            actions: Tableau (N,) d'indices d'actions
+
+        Returns:
+            next_states: Tableau (N,) des états atteints (avant remise à zéro)
+            rewards: Tableau (N,) des récompenses
+            dones: Tableau (N,) indiquant les épisodes terminés; ces agents
+                repartent de la case de départ au pas suivant
+        """
+        if self.success_prob < 1.0:
+            # Glissement vers l'une des deux directions perpendiculaires
+            u = self.rng.random(self.n_envs)
+            side = (u >= (1.0 + self.success_prob) / 2).astype(np.int64)
+            actions = np.where(u < self.success_prob, actions, self.perpendicular[actions, side])
+
+        states = self._states
+        next_states = self.next_state[states, actions]
+        rewards = self.reward[states, actions]
+
+        # Un mouvement contre un bord laisse l'agent sur place (pénalité incluse dans reward)
+        dones = self.terminal[next_states] & (next_states != states)
+
+        # Remise au départ des agents dont l'épisode est terminé
+        self._states = np.where(dones, self.start, next_states)
+
+        return next_states, rewards, dones
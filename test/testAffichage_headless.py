@@ -0,0 +1,50 @@
+import os
+import tempfile
+import time
+from src.Affichage import Affichage, render_batch
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.Qlearning import QLearning
+from src.ValueIteration import ValueIteration
+
+def test_affichage_headless():
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Toutes les figures enregistrées sans fenêtre
+        env = FrozenLake()
+        agent = QLearning(env, seed=0, callback=Callback())
+        agent.train(episodes=2000)
+        affichage = Affichage(env, output_dir=output_dir)
+        paths = [
+            affichage.afficher(),
+            affichage.afficher_q_table(agent.Q),
+            affichage.afficher_policy(agent.get_policy()),
+            affichage.afficher_valeurs_etat(agent.get_value_function()),
+            affichage.afficher_statistiques(agent.training_stats),
+            affichage.afficher_trajectory(agent.record_trajectory()),
+        ]
+        assert all(os.path.getsize(path) > 0 for path in paths)
+
+        # Grande grille: dessin vectorisé, sans étiquette par case
+        env = generate_lakes(1, 300, seed=0)[0]
+        V, policy, Q = ValueIteration(env, backend='numpy', callback=Callback()).run()
+        affichage = Affichage(env, output_dir=output_dir, image_format='svg')
+        start = time.perf_counter()
+        affichage.afficher_policy(policy)
+        affichage.afficher_valeurs_etat(V)
+        print(f"Politique et valeurs 300x300 (SVG) en {time.perf_counter() - start:.2f} s")
+
+        # Lot de rendus dans des processus de travail
+        lakes = generate_lakes(4, 50, seed=1)
+        jobs = []
+        for k, lake in enumerate(lakes):
+            V, policy, Q = ValueIteration(lake, backend='numpy', callback=Callback()).run()
+            jobs.append((lake, 'afficher_policy', (policy,), f'politique_{k}'))
+            jobs.append((lake, 'afficher_valeurs_etat', (V,), f'valeurs_{k}'))
+        start = time.perf_counter()
+        paths = render_batch(jobs, output_dir)
+        print(f"{len(paths)} figures rendues en {time.perf_counter() - start:.2f} s dans {output_dir}")
+        assert all(os.path.exists(path) for path in paths)
+
+if __name__ == "__main__":
+    test_affichage_headless()
@@ -0,0 +1,38 @@
+import time
+import numpy as np
+from src.BackwardSolver import BackwardSolver
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.ValueIteration import ValueIteration
+
+def test_backward_solver():
+    # Carte du sujet: mêmes valeurs que Value Iteration
+    env = FrozenLake()
+    V_ref, _, _ = ValueIteration(env).run(seuil=1e-10)
+    V, policy, Q = BackwardSolver(env).run(as_dict=True)
+    assert max(abs(V[state] - V_ref[state]) for state in V_ref) < 1e-8
+
+    # Oracle pour le backend numpy, sur des cartes denses (zones isolées) et à plusieurs buts
+    lakes = generate_lakes(20, 30, hole_density=0.4, seed=0, n_goals=3)
+    for env in lakes:
+        V_exact, policy_exact, Q_exact = BackwardSolver(env, gamma=0.9).run()
+        V, policy, Q = ValueIteration(env, gamma=0.9, backend='numpy').run(seuil=1e-12, max_iterations=10000)
+        assert np.abs(V - V_exact).max() < 1e-8
+        assert np.abs(Q - Q_exact).max() < 1e-8
+
+    # Remplaçant direct de ValueIteration: mêmes arguments positionnels et nommés acceptés
+    env = FrozenLake()
+    for solver in (ValueIteration(env, backend='numpy', callback=Callback()), BackwardSolver(env)):
+        V_a, _, _ = solver.run(seuil=1e-6)
+        V_b, _, _ = solver.run(1e-6, 1000, as_dict=True)
+        assert V_a.shape == (env.grid_size ** 2,) and isinstance(V_b, dict)
+
+    # Grande carte: une seule passe, sans itérer jusqu'à convergence
+    env = generate_lakes(1, 1000, hole_density=0.2, seed=0)[0]
+    start = time.perf_counter()
+    BackwardSolver(env).run()
+    print(f"Résolution exacte d'un lac 1000x1000 en {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    test_backward_solver()
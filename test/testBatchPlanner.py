@@ -0,0 +1,44 @@
+import time
+import numpy as np
+from src.BatchPlanner import BatchPlanner
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_layouts, generate_lakes
+from src.ValueIteration import ValueIteration
+
+def test_batch_planner():
+    # Mêmes résultats que ValueIteration carte par carte, y compris l'arrêt par carte
+    layouts = generate_layouts(50, 10, hole_density=0.3, seed=0, n_goals=2)
+    planner = BatchPlanner(layouts, gamma=0.9, callback=Callback())
+    V, policy, Q = planner.run(seuil=1e-6)
+    assert V.shape == (50, 100) and policy.shape == (50, 100) and Q.shape == (50, 100, 4)
+    for k, layout in enumerate(layouts):
+        vi = ValueIteration(FrozenLake.from_layout(layout), gamma=0.9, backend='numpy', callback=Callback())
+        V_ref, policy_ref, Q_ref = vi.run(seuil=1e-6)
+        assert planner.iterations[k] == vi.iterations
+        assert np.array_equal(V[k], V_ref) and np.array_equal(Q[k], Q_ref)
+        assert np.array_equal(policy[k], policy_ref)
+    print(f"Itérations par carte: de {planner.iterations.min()} à {planner.iterations.max()}")
+
+    # 10 000 lacs 7x7 en un appel, comparés à une résolution unique de taille équivalente
+    layouts = generate_layouts(10000, 7, hole_density=0.2, seed=1)
+    start = time.perf_counter()
+    BatchPlanner(layouts, callback=Callback()).run()
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for layout in layouts[:200]:
+        ValueIteration(FrozenLake.from_layout(layout), backend='numpy', callback=Callback()).run()
+    loop_time = (time.perf_counter() - start) * len(layouts) / 200
+
+    env = generate_lakes(1, 700, hole_density=0.2, seed=1)[0]
+    start = time.perf_counter()
+    ValueIteration(env, backend='numpy', callback=Callback()).run()
+    large_time = time.perf_counter() - start
+
+    print(f"10 000 lacs 7x7: {batch_time:.2f} s en lot, ~{loop_time:.2f} s un par un; "
+          f"un lac 700x700: {large_time:.2f} s")
+    assert batch_time < loop_time
+
+if __name__ == "__main__":
+    test_batch_planner()
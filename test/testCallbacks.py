@@ -0,0 +1,65 @@
+import contextlib
+import io
+import time
+from src.Callbacks import Callback, ProgressLogger
+from src.FrozenLake import FrozenLake
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.ValueIteration import ValueIteration
+
+class Recorder(Callback):
+    """
+    Callback de test: enregistre les notifications reçues.
+    """
+    def __init__(self):
+        self.deltas = []
+        self.episodes = 0
+        self.converged = None
+
+    def on_iteration(self, algorithm, iteration, delta):
+        self.deltas.append(delta)
+
+    def on_episode_end(self, algorithm, episode, reward, steps):
+        self.episodes = episode
+
+    def on_converged(self, algorithm, iterations, delta):
+        self.converged = (iterations, delta)
+
+def test_callbacks():
+    env = FrozenLake()
+
+    # Notifications des planificateurs et de l'agent
+    recorder = Recorder()
+    vi = ValueIteration(env, backend='numpy', callback=recorder)
+    vi.run(seuil=1e-6)
+    assert len(recorder.deltas) == vi.iterations and recorder.converged[0] == vi.iterations
+    recorder = Recorder()
+    pi = PolicyIteration(env, callback=recorder)
+    pi.run()
+    assert len(recorder.deltas) == pi.iterations
+    recorder = Recorder()
+    QLearning(env, seed=0, callback=recorder).train(episodes=500)
+    assert recorder.episodes == 500
+
+    # Mode silencieux: aucun affichage
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        ValueIteration(env, callback=Callback()).run()
+        QLearning(env, seed=0, callback=Callback()).train_batch(episodes=500)
+    assert output.getvalue() == ""
+
+    # Affichage par défaut limité dans le temps
+    output = io.StringIO()
+    QLearning(env, seed=0, callback=ProgressLogger(interval=0.5, file=output)).train(episodes=5000)
+    print(f"{len(output.getvalue().splitlines())} messages pour 5000 épisodes")
+
+    # Coût d'un entraînement silencieux comparé à l'affichage par défaut
+    for name, callback in [('silencieux', Callback()), ('défaut', None)]:
+        agent = QLearning(env, seed=0, callback=callback)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent.train(episodes=5000)
+        print(f"{name:>10}: {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    test_callbacks()
@@ -0,0 +1,75 @@
+import glob
+import os
+import tempfile
+import time
+import numpy as np
+from src.Callbacks import Callback
+from src.Checkpoint import load_checkpoint
+from src.FrozenLake import FrozenLake
+from src.Qlearning import QLearning
+
+class Preemption(Exception):
+    pass
+
+class Preempt(Callback):
+    """
+    Interrompt l'entraînement à un épisode donné, comme l'arrêt d'une machine préemptible.
+    """
+    def __init__(self, episode):
+        self.episode = episode
+
+    def on_episode_end(self, algorithm, episode, reward, steps):
+        if episode == self.episode:
+            raise Preemption(episode)
+
+def test_checkpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'qlearning.npz')
+
+        # Entraînement de référence, sans interruption
+        reference = QLearning(FrozenLake(success_prob=0.9, seed=1), seed=0, callback=Callback())
+        start = time.perf_counter()
+        reference.train(episodes=3000, keep_history=False)
+        print(f"Sans point de reprise: {time.perf_counter() - start:.2f} s")
+
+        # Entraînement interrompu après le point de reprise de l'épisode 2000
+        agent = QLearning(FrozenLake(success_prob=0.9, seed=1), seed=0, callback=Preempt(2500))
+        start = time.perf_counter()
+        try:
+            agent.train(episodes=3000, keep_history=False, checkpoint=path, checkpoint_every=1000)
+        except Preemption:
+            pass
+        print(f"Interrompu à l'épisode 2500 après {time.perf_counter() - start:.2f} s")
+        assert os.path.exists(path) and not os.path.exists(path + '.tmp')
+
+        # Reprise par un nouveau processus: même résultat que l'entraînement ininterrompu
+        resumed = QLearning(FrozenLake(success_prob=0.9, seed=1), seed=0, callback=Callback())
+        rewards, steps = resumed.train(episodes=3000, checkpoint=path, checkpoint_every=1000, resume_from=path)
+        assert len(rewards) == 1000
+        assert np.array_equal(resumed.Q.values, reference.Q.values)
+        assert resumed.training_stats.summary() == reference.training_stats.summary()
+        print(resumed.training_stats.summary())
+
+        # Le dernier point de reprise couvre tout l'entraînement; sa Q-table est projetable
+        assert QLearning(FrozenLake(), callback=Callback()).load_checkpoint(path) == 3000
+        arrays = load_checkpoint(path, mmap_mode='r')
+        assert isinstance(arrays['Q'], np.memmap) and np.array_equal(arrays['Q'], reference.Q.values)
+        assert len(glob.glob(os.path.join(directory, 'qlearning.Q.*.npy'))) == 1
+        del arrays
+
+        # Reprise d'un entraînement déjà plus avancé: le point de reprise n'est pas réécrit en arrière
+        resumed = QLearning(FrozenLake(success_prob=0.9, seed=1), seed=0, callback=Callback())
+        resumed.train(episodes=2500, checkpoint=path, checkpoint_every=1000, resume_from=path)
+        assert QLearning(FrozenLake(), callback=Callback()).load_checkpoint(path) == 3000
+
+        # Une erreur d'écriture ne masque pas l'interruption de l'entraînement
+        agent = QLearning(FrozenLake(), seed=0, callback=Preempt(1500))
+        try:
+            agent.train(episodes=3000, checkpoint=os.path.join(directory, 'absent', 'q.npz'),
+                        checkpoint_every=1000)
+            assert False, "interruption perdue"
+        except Preemption:
+            pass
+
+if __name__ == "__main__":
+    test_checkpoint()
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+# Import et résolution dans un processus neuf: ni matplotlib ni scipy ne doivent être chargés
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.ValueIteration import ValueIteration
+imported = time.perf_counter() - start
+env = FrozenLake()
+ValueIteration(env, callback=Callback()).run()
+PolicyIteration(env, callback=Callback()).run()
+QLearning(env, seed=0, callback=Callback()).train(episodes=100)
+print(imported, 'matplotlib' in sys.modules, 'scipy' in sys.modules)
+"""
+
+def test_imports():
+    output = subprocess.run([sys.executable, '-c', SCRIPT], capture_output=True, text=True, check=True).stdout
+    imported, matplotlib_loaded, scipy_loaded = output.split()
+    print(f"Import des algorithmes en {float(imported) * 1000:.0f} ms")
+    assert matplotlib_loaded == 'False' and scipy_loaded == 'False'
+
+if __name__ == "__main__":
+    test_imports()
@@ -0,0 +1,45 @@
+import json
+import time
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.ValueIteration import ValueIteration
+
+def test_instrumentation():
+    env = FrozenLake()
+
+    # Répartition du temps entre évaluation et amélioration
+    pi = PolicyIteration(env, callback=Callback(), instrument=True)
+    pi.run()
+    print(pi.stats.to_json())
+    assert pi.stats.counters['iterations'] == pi.iterations
+    assert set(pi.stats.timers) == {'evaluation', 'improvement'}
+
+    # Compteurs et chronomètres des backends de Value Iteration
+    for backend in ValueIteration.BACKENDS:
+        vi = ValueIteration(env, backend=backend, callback=Callback(), instrument=True)
+        vi.run()
+        print(backend, vi.stats)
+        assert vi.stats.counters['backups'] == vi.backups
+
+    # Répartition du temps d'un pas d'apprentissage, exportée en JSON
+    agent = QLearning(env, seed=0, callback=Callback(), instrument=True)
+    agent.train(episodes=1000)
+    report = json.loads(agent.stats.to_json())
+    assert report['counters']['episodes'] == 1000
+    assert abs(report['counters']['env_steps'] - agent.training_stats.mean_steps * 1000) < 1e-6
+    print(report)
+
+    # Désactivé: seuls les compteurs sont renseignés, pour un coût négligeable
+    for instrument in [False, True, False, True]:
+        agent = QLearning(env, seed=0, callback=Callback(), instrument=instrument)
+        start = time.perf_counter()
+        agent.train(episodes=5000)
+        print(f"instrument={instrument}: {time.perf_counter() - start:.3f} s, chronomètres: {sorted(agent.stats.timers)}")
+    agent = QLearning(env, seed=0, callback=Callback(), instrument=True)
+    agent.train_batch(episodes=1000)
+    print(agent.stats)
+
+if __name__ == "__main__":
+    test_instrumentation()
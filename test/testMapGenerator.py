@@ -0,0 +1,40 @@
+import time
+import numpy as np
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_layouts, generate_lakes, is_solvable
+
+def test_map_generator():
+    # Génération en masse
+    start = time.perf_counter()
+    layouts = generate_layouts(1000, 50, hole_density=0.3, seed=0, n_goals=3)
+    elapsed = time.perf_counter() - start
+    print(f"1000 cartes 50x50 générées en {elapsed:.2f} s")
+
+    assert layouts.shape == (1000, 50, 50)
+    assert np.all((layouts == FrozenLake.GOAL).sum(axis=(1, 2)) == 3)
+    assert np.all(layouts[:, -1, -1] == FrozenLake.START)
+    assert all(is_solvable(layout) for layout in layouts)
+    print(f"Densité de trous observée: {np.mean(layouts == FrozenLake.HOLE):.3f}")
+
+    # Même graine et mêmes paramètres: carte servie depuis le cache
+    start = time.perf_counter()
+    again = generate_layouts(1000, 50, hole_density=0.3, seed=0, n_goals=3)
+    print(f"Relecture depuis le cache en {time.perf_counter() - start:.6f} s")
+    assert again is layouts
+
+    # Graine NumPy: même clé de cache qu'un entier; Generator: tirage sans mise en cache
+    assert generate_layouts(1000, 50, hole_density=0.3, seed=np.int64(0), n_goals=3) is layouts
+    from_rng = generate_layouts(20, 10, seed=np.random.default_rng(3))
+    assert np.array_equal(from_rng, generate_layouts(20, 10, seed=3))
+    assert generate_layouts(20, 10, seed=np.random.default_rng(3)) is not from_rng
+
+    # Grandes cartes utilisables telles quelles par les environnements
+    start = time.perf_counter()
+    lakes = generate_lakes(2, 1000, hole_density=0.2, seed=1)
+    print(f"2 lacs 1000x1000 générés en {time.perf_counter() - start:.2f} s")
+    lake = lakes[0]
+    print(f"Départ {lake.start}, but {lake.goal}, {len(lake.traps)} trous")
+    assert np.array_equal(lake.get_layout(), generate_layouts(2, 1000, hole_density=0.2, seed=1)[0])
+
+if __name__ == "__main__":
+    test_map_generator()
@@ -0,0 +1,27 @@
+import time
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.PolicyIteration import PolicyIteration
+
+def test_linear_evaluation():
+    # Carte du sujet et carte générée: résolution directe et balayages donnent le même résultat
+    lakes = [FrozenLake(), generate_lakes(1, 30, hole_density=0.3, seed=0, n_goals=2)[0]]
+    for env in lakes:
+        results = {}
+        for evaluation in ('sweep', 'linear'):
+            pi = PolicyIteration(env, gamma=0.9, theta=1e-10, evaluation=evaluation, seed=0, callback=Callback())
+            start = time.perf_counter()
+            policy = pi.run()
+            elapsed = time.perf_counter() - start
+            results[evaluation] = (dict(policy), dict(pi.V))
+            print(f"{env.grid_size}x{env.grid_size}, évaluation {evaluation!r}: {pi.iterations} itérations, "
+                  f"{pi.stats.counters['linear_solves']} résolutions linéaires en {elapsed:.3f} s")
+
+        policy_sweep, V_sweep = results['sweep']
+        policy_linear, V_linear = results['linear']
+        assert policy_sweep == policy_linear
+        assert max(abs(V_sweep[state] - V_linear[state]) for state in V_sweep) < 1e-8
+
+if __name__ == "__main__":
+    test_linear_evaluation()
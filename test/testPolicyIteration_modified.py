@@ -0,0 +1,45 @@
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.PolicyIteration import PolicyIteration
+
+def test_modified_policy_iteration():
+    for env in (FrozenLake(), generate_lakes(1, 20, hole_density=0.3, seed=1)[0]):
+        # Référence: Policy Iteration complète
+        full = PolicyIteration(env, gamma=0.9, theta=1e-10, seed=0, callback=Callback())
+        policy = dict(full.run())
+        V = dict(full.V)
+        print(f"{env.grid_size}x{env.grid_size} complète: {full.iterations} itérations, "
+              f"{full.eval_sweeps} balayages d'évaluation")
+
+        # Policy Iteration modifiée: k balayages par évaluation, même point fixe
+        for k in (1, 3, 10):
+            modified = PolicyIteration(env, gamma=0.9, theta=1e-10, max_eval_sweeps=k, seed=0, callback=Callback())
+            assert dict(modified.run()) == policy
+            assert max(abs(modified.V[state] - V[state]) for state in V) < 1e-8
+            # Arrêt seulement quand la politique est stable ET les valeurs convergées
+            assert modified.iterations > 1
+            print(f"  k={k}: {modified.iterations} itérations, {modified.eval_sweeps} balayages d'évaluation")
+
+        # Nombre de balayages invalide refusé (0 ne ferait jamais converger l'évaluation)
+        for k in (0, -1, 2.5, True):
+            try:
+                PolicyIteration(env, max_eval_sweeps=k, callback=Callback())
+                assert False, f"max_eval_sweeps={k!r} accepté"
+            except ValueError:
+                pass
+
+        # Démarrage à chaud depuis une solution convergée, dans les deux formats de politique
+        for initial_policy in (policy, full.get_policy()):
+            warm = PolicyIteration(env, gamma=0.9, theta=1e-10, seed=1, callback=Callback())
+            assert dict(warm.run(initial_policy=initial_policy, initial_V=V)) == policy
+            assert warm.iterations == 1
+            assert max(abs(warm.V[state] - V[state]) for state in V) < 1e-8
+
+        # Politique de départ seule: valeurs recalculées, quelques balayages suffisent
+        warm = PolicyIteration(env, gamma=0.9, theta=1e-10, seed=1, callback=Callback())
+        assert dict(warm.run(initial_policy=policy)) == policy
+        assert warm.iterations == 1 and warm.eval_sweeps < full.eval_sweeps
+
+if __name__ == "__main__":
+    test_modified_policy_iteration()
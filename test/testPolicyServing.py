@@ -0,0 +1,89 @@
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+from src.BackwardSolver import BackwardSolver
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.Storage import load_tables, save_tables
+from src.ValueIteration import ValueIteration
+
+def test_policy_serving():
+    env = FrozenLake()
+
+    # Mêmes actions que les politiques sous forme de dictionnaires
+    vi = ValueIteration(env, callback=Callback())
+    V, policy_dict, Q = vi.run()
+    policy = vi.compile_policy()
+    for state, probs in policy_dict.items():
+        expected = max(probs, key=probs.get) if max(probs.values()) > 0 else None
+        assert policy.action(state) == expected
+    assert policy.action(env.goal) is None
+    vi = ValueIteration(env, backend='numpy', callback=Callback())
+    vi.run()
+    assert vi.compile_policy().action(env.goal) is None
+
+    pi = PolicyIteration(env, callback=Callback())
+    pi.run()
+    assert all(pi.compile_policy()[state] == action for state, action in pi.policy.items())
+    trajectory = pi.record_trajectory()
+    print(f"Policy Iteration: état final {trajectory[-1][0]} en {len(trajectory) - 1} étapes")
+
+    agent = QLearning(env, seed=0, callback=Callback())
+    agent.train(episodes=2000)
+    trajectory = agent.record_trajectory()
+    print(f"Q-Learning: état final {trajectory[-1][0]} en {len(trajectory) - 1} étapes")
+
+    # Positions hors de la grille refusées (jamais l'action d'une autre case)
+    for outside in ([[0, 7]], [[-1, 3]], [[3, 3], [7, 0]]):
+        try:
+            policy.act(outside)
+            assert False, f"position hors grille acceptée: {outside}"
+        except IndexError as error:
+            print(f"Refusé: {error}")
+    try:
+        policy.act_index([49])
+        assert False, "indice hors grille accepté"
+    except IndexError:
+        pass
+    assert np.array_equal(policy.act([[6, 6]], check=False), policy.act([[6, 6]]))
+
+    # Sérialisation compacte: la politique ne référence pas l'environnement
+    data = pickle.dumps(policy)
+    assert pickle.loads(data) == policy
+    print(f"Politique 7x7 sérialisée en {len(data)} octets")
+
+    # Requêtes par lots sur un grand lac
+    env = generate_lakes(1, 1000, hole_density=0.2, seed=0)[0]
+    solver = BackwardSolver(env)
+    solver.run()
+    policy = solver.compile_policy()
+    rng = np.random.default_rng(0)
+    positions = rng.integers(1000, size=(1_000_000, 2))
+    for check in (True, False):
+        start = time.perf_counter()
+        actions = policy.act(positions, check=check)
+        elapsed = time.perf_counter() - start
+        print(f"check={check}: {len(positions) / elapsed / 1e6:.0f} millions d'actions par seconde")
+    assert actions.dtype == np.int8
+    states = positions[:, 0] * 1000 + positions[:, 1]
+    terminal = env.terminal_mask.ravel()[states]
+    assert np.array_equal(actions[~terminal], solver.policy_array[states[~terminal]])
+    assert np.all(actions[terminal] == -1)
+    assert len(pickle.dumps(policy)) < 1.1 * len(policy)
+
+    # Politique servie directement depuis un fichier projeté en mémoire
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tables.bin')
+        save_tables(path, env, solver.gamma, policy=policy)
+        served = load_tables(path, frozen_lake=env).compiled_policy()
+        assert isinstance(served.table, np.memmap)
+        assert np.array_equal(served.act(positions), actions)
+        del served
+
+if __name__ == "__main__":
+    test_policy_serving()
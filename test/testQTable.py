@@ -0,0 +1,29 @@
+import numpy as np
+from src.FrozenLake import FrozenLake
+from src.Qlearning import QLearning
+
+def test_q_table():
+    env = FrozenLake(grid_size=7)
+    agent = QLearning(env, alpha=0.2, gamma=0.9, epsilon=0.1, dtype=np.float32)
+    agent.train(episodes=2000)
+
+    # La Q-table est un tableau (S, A) contigu
+    print(f"Q-table: forme {agent.Q.values.shape}, type {agent.Q.values.dtype}")
+    assert agent.Q.values.shape == (env.grid_size ** 2, len(env.actions))
+    assert agent.Q.values.flags['C_CONTIGUOUS']
+
+    # La vue dictionnaire reste disponible en lecture seule
+    state = env.start
+    print(f"Q{state} = {agent.Q[state]}")
+    for a, action in enumerate(env.actions):
+        assert agent.Q[state][action] == agent.Q.values[agent.Q.index(state), a]
+    assert len(agent.Q) == env.grid_size ** 2
+    assert agent.Q.as_dict()[state] == dict(agent.Q[state])
+
+    # La politique extraite mène au but
+    trajectory = agent.record_trajectory(max_steps=100)
+    print(f"Trajectoire: {[t[0] for t in trajectory]}")
+    assert trajectory[-1][0] == env.goal
+
+if __name__ == "__main__":
+    test_q_table()
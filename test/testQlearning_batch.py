@@ -0,0 +1,55 @@
+import time
+import numpy as np
+
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.Qlearning import QLearning
+
+def test_qlearning_batch():
+    # Paramètres
+    grid_size = 7
+    episodes = 5000
+    alpha = 0.1
+    gamma = 0.99
+    epsilon = 0.01
+    n_envs_values = [16, 256]  # Nombre d'agents entraînés en parallèle
+
+    env = FrozenLake(grid_size=grid_size)
+
+    for n_envs in n_envs_values:
+        print(f"\n--- Entraînement par lots avec {n_envs} agents ---")
+        agent = QLearning(env, alpha=alpha, gamma=gamma, epsilon=epsilon, callback=Callback())
+
+        start = time.perf_counter()
+        rewards, steps = agent.train_batch(episodes=episodes, n_envs=n_envs)
+        elapsed = time.perf_counter() - start
+
+        print(f"Temps d'entraînement : {elapsed:.2f} s ({sum(steps) / elapsed:,.0f} pas par seconde)")
+        print(f"Récompense moyenne sur les 100 derniers épisodes : {np.mean(rewards[-100:]):.2f}")
+
+        # La politique apprise doit mener au but
+        trajectory = agent.record_trajectory(max_steps=100)
+        print(f"État final de la trajectoire : {trajectory[-1][0]}")
+        assert trajectory[-1][0] in env.goal_set
+
+    # Un même couple (état, action) visité par tous les agents: une seule mise à jour
+    # de pas alpha avec l'erreur TD moyenne, et non la somme des erreurs
+    n_envs = 8
+    agent = QLearning(env, alpha=alpha, gamma=gamma, epsilon=0, seed=0, callback=Callback())
+    s = env.start[0] * grid_size + env.start[1]
+    a = 2  # 'left'
+    agent.Q.values[s, a] = 1.0
+    before = agent.Q.values.copy()
+    next_state, reward, terminal = env.get_transition_model()
+    ns = next_state[s, a]
+    td = reward[s, a] + gamma * before[ns].max() * (not terminal[ns]) - before[s, a]
+
+    agent.train_batch(episodes=n_envs, n_envs=n_envs, max_steps=1)
+    assert agent.Q.values[s, a] == before[s, a] + alpha * td
+    assert agent.Q.values[s, a] != before[s, a] + n_envs * alpha * td
+    changed = agent.Q.values != before
+    changed[s, a] = False
+    assert not changed.any()
+
+if __name__ == "__main__":
+    test_qlearning_batch()
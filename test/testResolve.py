@@ -0,0 +1,56 @@
+import time
+import numpy as np
+from src.BackwardSolver import BackwardSolver
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.ValueIteration import ValueIteration
+
+def test_resolve():
+    # Carte du sujet: ajout d'un piège puis déplacement du but
+    env = FrozenLake()
+    vi = ValueIteration(env, backend='prioritized')
+    vi.run(seuil=1e-10)
+    for change in [dict(add_traps=[(1, 1)]), dict(remove_traps=[(1, 1), (2, 2)]), dict(goals=[(3, 3)])]:
+        changed = env.update_map(**change)
+        V, policy, Q = vi.resolve(changed, seuil=1e-10)
+        V_exact, _, Q_exact = BackwardSolver(env).run()
+        assert np.abs(V - V_exact).max() < 1e-8
+        assert np.abs(Q - Q_exact).max() < 1e-8
+
+    # Modifications invalides refusées avant toute mise à jour: carte et modèle intacts
+    layout = env.get_layout()
+    model = [array.copy() for array in env.get_transition_model()]
+    invalid = [dict(goals=[]), dict(goals=[env.start]), dict(add_traps=[(7, 0)]),
+               dict(remove_traps=[(-1, 2)]), dict(add_traps=[(1, 1)], goals=[(1, 1)]),
+               dict(add_traps=[(1, 1)], goals=[(0, 9)])]
+    for change in invalid:
+        try:
+            env.update_map(**change)
+            assert False, f"modification invalide acceptée: {change}"
+        except ValueError as error:
+            print(f"Refusé: {error}")
+        assert np.array_equal(env.get_layout(), layout) and env.goal == (3, 3)
+        assert all(np.array_equal(a, b) for a, b in zip(env.get_transition_model(), model))
+
+    # Grande carte: la re-résolution ne touche que la zone affectée par la modification
+    env = generate_lakes(1, 300, hole_density=0.15, seed=0)[0]
+    vi = ValueIteration(env, backend='prioritized')
+    start = time.perf_counter()
+    vi.run(seuil=1e-6, max_iterations=10000)
+    print(f"Résolution complète: {vi.backups} mises à jour en {time.perf_counter() - start:.2f} s")
+    full_backups = vi.backups
+
+    # Trois pièges posés sur des cases gelées de valeur médiane, à mi-distance du but
+    free = np.flatnonzero((env.get_layout().ravel() == FrozenLake.FROZEN) & (vi.V_array > 0))
+    free = free[np.argsort(vi.V_array[free])][len(free) // 2:len(free) // 2 + 3]
+    changed = env.update_map(add_traps=[env.index_to_state(s) for s in free.tolist()])
+    start = time.perf_counter()
+    V, policy, Q = vi.resolve(changed, seuil=1e-6, max_iterations=10000)
+    print(f"Re-résolution: {vi.backups} mises à jour en {time.perf_counter() - start:.2f} s")
+
+    V_exact, _, _ = BackwardSolver(env).run()
+    assert np.abs(V - V_exact).max() < 1e-4
+    assert vi.backups < full_backups
+
+if __name__ == "__main__":
+    test_resolve()
@@ -0,0 +1,65 @@
+import numpy as np
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_layouts
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.ValueIteration import ValueIteration
+
+def test_slippery():
+    # Fréquences empiriques des glissements
+    env = FrozenLake(success_prob=0.8, seed=0)
+    moves = []
+    for _ in range(10000):
+        env.state = (3, 3)
+        moves.append(env.step('up')[0])
+    counts = {move: moves.count(move) / len(moves) for move in set(moves)}
+    print(f"Issues de 'up' depuis (3, 3): {counts}")
+    assert abs(counts[(2, 3)] - 0.8) < 0.02 and abs(counts[(3, 2)] - 0.1) < 0.02
+
+    # Modèle creux: distributions normalisées depuis les états non terminaux
+    P, reward, terminal = env.get_sparse_model()
+    sums = np.asarray(P.sum(axis=1)).reshape(env.grid_size ** 2, -1)
+    assert np.allclose(sums[~terminal], 1.0) and np.all(sums[terminal] == 0)
+
+    # Value Iteration et Policy Iteration s'accordent sur la dynamique stochastique
+    V, policy, Q = ValueIteration(env, backend='numpy', callback=Callback()).run(seuil=1e-10)
+    for evaluation in PolicyIteration.EVALUATIONS:
+        pi = PolicyIteration(env, evaluation=evaluation, theta=1e-10, seed=0, callback=Callback())
+        pi.run()
+        V_pi = np.array([pi.V[state] for state in pi.states])
+        active = ~terminal
+        assert np.abs(V_pi[active] - V[active]).max() < 1e-6
+
+    # success_prob = 1: le chemin creux retrouve la dynamique déterministe
+    layout = generate_layouts(1, 100, hole_density=0.2, seed=0)[0]
+    V_det, _, _ = ValueIteration(FrozenLake.from_layout(layout), backend='numpy', callback=Callback()).run(seuil=1e-8)
+    vi = ValueIteration(FrozenLake.from_layout(layout), backend='numpy', callback=Callback())
+    D, reward = vi._compiled_expectation()
+    assert D.nnz == np.count_nonzero(~vi.frozen_lake.terminal_mask) * vi.n_actions
+    V_sparse = np.zeros(vi.n_states)
+    for _ in range(vi.iterations or 1000):
+        V_new = (reward + (D @ V_sparse).reshape(reward.shape)).max(axis=1)
+        if np.abs(V_new - V_sparse).max() < 1e-8:
+            break
+        V_sparse = V_new
+    assert np.abs(V_sparse - V_det).max() < 1e-6
+
+    # Grande carte glissante: même ordre de coût par balayage que le chemin déterministe
+    layout = generate_layouts(1, 500, hole_density=0.2, seed=0)[0]
+    for success_prob in [1.0, 0.8]:
+        vi = ValueIteration(FrozenLake.from_layout(layout, success_prob=success_prob), backend='numpy',
+                            callback=Callback(), instrument=True)
+        vi.run(seuil=1e-6, max_iterations=10000)
+        print(f"success_prob={success_prob}: {vi.iterations} balayages, "
+              f"{vi.stats.timers['sweeps'] / vi.iterations * 1000:.2f} ms par balayage")
+
+    # Q-learning sur la dynamique stochastique (scalaire et par lots)
+    env = FrozenLake(success_prob=0.8, seed=0)
+    agent = QLearning(env, seed=0, callback=Callback())
+    agent.train(episodes=500)
+    agent.train_batch(episodes=500, n_envs=32)
+    print(f"Récompense moyenne récente: {agent.training_stats.moving_reward:.2f}")
+
+if __name__ == "__main__":
+    test_slippery()
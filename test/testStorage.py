@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+import numpy as np
+from src.BackwardSolver import BackwardSolver
+from src.Callbacks import Callback
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.PolicyIteration import PolicyIteration
+from src.Qlearning import QLearning
+from src.Storage import load_tables, save_tables
+from src.ValueIteration import ValueIteration
+
+def test_storage():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tables.bin')
+        env = FrozenLake()
+
+        # Résultats sous forme de dictionnaires (ValueIteration python)
+        V, policy, Q = ValueIteration(env, callback=Callback()).run()
+        save_tables(path, env, 0.9, V=V, Q=Q, policy=policy)
+        tables = load_tables(path, frozen_lake=env)
+        assert isinstance(tables.V, np.memmap) and tables.gamma == 0.9
+        assert all(tables.value(state) == V[state] for state in V)
+        assert tables.q_values((6, 6)) == Q[(6, 6)]
+        assert tables.action((6, 6)) == max(policy[(6, 6)], key=policy[(6, 6)].get)
+        assert tables.action(env.goal) is None
+
+        # PolicyIteration ({état: action}) et QLearning (QTable float32)
+        pi = PolicyIteration(env, callback=Callback())
+        pi.run()
+        save_tables(path, env, pi.gamma, V=pi.V, policy=pi.policy)
+        tables = load_tables(path)
+        assert tables.Q is None and tables.action((6, 6)) == pi.policy[(6, 6)]
+
+        agent = QLearning(env, dtype=np.float32, seed=0, callback=Callback())
+        agent.train(episodes=500)
+        save_tables(path, env, agent.gamma, Q=agent.Q, policy=agent.get_policy())
+        tables = load_tables(path)
+        assert tables.Q.dtype == np.float32 and np.array_equal(tables.Q, agent.Q.values)
+
+        # Une carte différente est refusée
+        other = FrozenLake(traps=[(1, 1)])
+        try:
+            load_tables(path, frozen_lake=other)
+            assert False, "empreinte différente acceptée"
+        except ValueError as error:
+            print(f"Refusé: {error}")
+
+        # Grand lac: enregistrement des tableaux, ouverture et consultation sans lecture complète
+        env = generate_lakes(1, 2000, hole_density=0.2, seed=0)[0]
+        V, policy, Q = BackwardSolver(env).run()
+        start = time.perf_counter()
+        save_tables(path, env, 0.9, V=V, Q=Q, policy=policy)
+        print(f"Tables d'un lac 2000x2000 écrites en {time.perf_counter() - start:.2f} s "
+              f"({os.path.getsize(path) / 1e6:.0f} Mo)")
+
+        start = time.perf_counter()
+        tables = load_tables(path)
+        value = tables.value((1000, 1000))
+        print(f"Ouverture et consultation d'un état en {(time.perf_counter() - start) * 1e3:.2f} ms")
+        assert value == V[1000 * 2000 + 1000]
+        assert np.array_equal(tables.Q[:10], Q[:10]) and np.array_equal(tables.policy, policy)
+
+if __name__ == "__main__":
+    test_storage()
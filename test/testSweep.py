@@ -0,0 +1,26 @@
+import numpy as np
+from src.Sweep import run_sweep
+
+def test_sweep():
+    # Mêmes combinaisons que testQlearning_alpha_gamma, répétées sur plusieurs graines
+    param_grid = {
+        'alpha': [0.05, 0.1, 0.2],
+        'gamma': [0.8, 0.95, 0.99],
+        'epsilon': [0.01],
+    }
+    seeds = [0, 1, 2]
+    results = run_sweep(param_grid, seeds=seeds, episodes=2000, grid_size=7)
+    assert len(results) == 3 * 3 * len(seeds)
+
+    print(f"{'alpha':>6} {'gamma':>6} {'seed':>5} {'temps (s)':>10} {'récompense (100 derniers)':>26}")
+    for run in results:
+        print(f"{run['alpha']:>6} {run['gamma']:>6} {run['seed']:>5} {run['time']:>10.2f} "
+              f"{np.mean(run['rewards'][-100:]):>26.2f}")
+
+    # Une même graine doit redonner le même entraînement
+    again = run_sweep({'alpha': [0.1], 'gamma': [0.99], 'epsilon': [0.01]}, seeds=[1], episodes=2000)
+    reference = results[(results['alpha'] == 0.1) & (results['gamma'] == 0.99) & (results['seed'] == 1)]
+    assert np.array_equal(again['Q'][0], reference['Q'][0])
+
+if __name__ == "__main__":
+    test_sweep()
@@ -0,0 +1,39 @@
+import time
+import numpy as np
+from src.FrozenLake import FrozenLake
+from src.Qlearning import QLearning
+from src.TrainingStats import TrainingStats
+
+def test_training_stats():
+    # Comparaison avec le calcul sur l'historique complet
+    rng = np.random.default_rng(0)
+    rewards = rng.normal(50, 20, size=100003)
+    steps = rng.integers(1, 200, size=rewards.size)
+    stats = TrainingStats(window=100, history_size=1000)
+    start = time.perf_counter()
+    stats.extend(rewards.tolist(), steps.tolist())
+    print(f"{stats.count} épisodes enregistrés en {time.perf_counter() - start:.2f} s")
+
+    assert abs(stats.mean_reward - rewards.mean()) < 1e-9
+    assert abs(stats.std_reward - rewards.std()) < 1e-9
+    assert abs(stats.var_steps - steps.var()) < 1e-6
+    assert abs(stats.moving_reward - rewards[-100:].mean()) < 1e-9
+    assert abs(stats.moving_steps - steps[-100:].mean()) < 1e-9
+    recent_rewards, recent_steps = stats.recent()
+    assert np.array_equal(recent_rewards, rewards[-100:])
+
+    # Historique borné: blocs d'épisodes consécutifs de taille puissance de 2
+    episodes, history_rewards, history_steps = stats.history()
+    print(f"Historique: {len(episodes)} points, blocs de {stats.stride} épisodes")
+    assert len(episodes) <= 1000
+    n = len(episodes) * stats.stride
+    assert np.allclose(history_rewards, rewards[:n].reshape(-1, stats.stride).mean(axis=1))
+
+    # Entraînement sans historique complet: seules les statistiques en flux sont conservées
+    agent = QLearning(FrozenLake(), seed=0)
+    rewards, steps = agent.train(episodes=1000, keep_history=False)
+    assert rewards is None and agent.training_stats.count == 1000
+    print(agent.training_stats.summary())
+
+if __name__ == "__main__":
+    test_training_stats()
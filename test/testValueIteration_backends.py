@@ -0,0 +1,30 @@
+import time
+import numpy as np
+from src.FrozenLake import FrozenLake
+from src.MapGenerator import generate_lakes
+from src.ValueIteration import ValueIteration
+
+def test_value_iteration_backends():
+    # Tous les backends doivent converger vers les mêmes valeurs
+    env = FrozenLake()
+    V_ref, _, _ = ValueIteration(env, backend='python').run(seuil=1e-8, as_dict=True)
+    for backend in ['numpy', 'prioritized']:
+        V, policy, Q = ValueIteration(env, backend=backend).run(seuil=1e-8, as_dict=True)
+        assert max(abs(V[state] - V_ref[state]) for state in V_ref) < 1e-6
+
+    # Sur une grande carte, le balayage prioritaire ne met à jour qu'une fraction des états
+    env = generate_lakes(1, 300, hole_density=0.15, seed=0)[0]
+    results = {}
+    for backend in ['numpy', 'prioritized']:
+        vi = ValueIteration(env, backend=backend)
+        start = time.perf_counter()
+        V, policy, Q = vi.run(seuil=1e-6, max_iterations=10000)
+        results[backend] = (V, vi.backups, time.perf_counter() - start)
+
+    for backend, (V, backups, elapsed) in results.items():
+        print(f"{backend:>12}: {backups:>10} mises à jour d'état en {elapsed:.2f} s")
+    assert np.abs(results['numpy'][0] - results['prioritized'][0]).max() < 1e-5
+    assert results['prioritized'][1] < results['numpy'][1]
+
+if __name__ == "__main__":
+    test_value_iteration_backends()
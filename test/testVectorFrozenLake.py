@@ -0,0 +1,35 @@
+import time
+import numpy as np
+from src.FrozenLake import FrozenLake
+from src.VectorFrozenLake import VectorFrozenLake
+
+def test_vector_frozen_lake():
+    env = FrozenLake(grid_size=7)
+    n_envs = 1000
+    venv = VectorFrozenLake(env, n_envs=n_envs)
+    rng = np.random.default_rng(0)
+
+    # Chaque agent doit suivre exactement la dynamique de FrozenLake.step
+    single = FrozenLake(grid_size=7)
+    for _ in range(200):
+        states = venv.states
+        actions = rng.integers(len(env.actions), size=n_envs)
+        next_states, rewards, dones = venv.step(actions)
+        for k in range(0, n_envs, 97):
+            single.state = single.index_to_state(states[k])
+            next_state, reward, done = single.step(env.actions[actions[k]])
+            assert single.state_to_index(next_state) == next_states[k]
+            assert reward == rewards[k] and done == dones[k]
+        assert np.all(venv.states[dones] == env.state_to_index(env.start))
+
+    # Débit de simulation
+    n_steps = 1000
+    actions = rng.integers(len(env.actions), size=(n_steps, n_envs))
+    start = time.perf_counter()
+    for t in range(n_steps):
+        venv.step(actions[t])
+    elapsed = time.perf_counter() - start
+    print(f"{n_steps * n_envs / elapsed:,.0f} pas d'environnement par seconde ({n_envs} agents)")
+
+if __name__ == "__main__":
+    test_vector_frozen_lake()